@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from sitegen.delimiter import (block_texts, cached_inline_html, cached_inline_text, frozen_block, iter_block_records, markdown_to_blocks,
+                               markdown_to_html_node, text_to_textnodes)
+from sitegen.generate import generate_pages_recursive
+from sitegen.htmlnode import LeafNode, ParentNode, frozen_leaf, frozen_parent
+from sitegen.textnode import text_node_to_html_node
+
+TEMPLATE = '<!DOCTYPE html>\n<html>\n<head><title> {{ Title }} </title></head>\n<body><article>\n{{ Content }}\n</article></body>\n</html>'
+BLOCK_MARKER = re.compile(r'^(#+ |\* |> |\d+\. )')
+WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'elven', 'river', 'valley', 'hobbit', 'ring', 'mountain', 'road']
+
+
+def inline_text(rng, words, density):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < density:
+            kind = rng.randrange(5)
+            if kind == 0:
+                word = f'**{word}**'
+            elif kind == 1:
+                word = f'*{word}*'
+            elif kind == 2:
+                word = f'`{word}`'
+            elif kind == 3:
+                word = f'[{word}](https://example.com/{word})'
+            else:
+                word = f'![{word}](/images/{word}.png)'
+        parts.append(word)
+    return ' '.join(parts)
+
+def markdown_page(rng, title, blocks, density):
+    parts = [f'# {title}']
+    for i in range(blocks):
+        kind = i % 6
+        if kind == 0:
+            parts.append(f'## {inline_text(rng, 4, density)}')
+        elif kind == 1:
+            parts.append('\n'.join(f'* {inline_text(rng, 6, density)}' for _ in range(5)))
+        elif kind == 2:
+            parts.append('\n'.join(f'{n}. {inline_text(rng, 6, density)}' for n in range(1, 6)))
+        elif kind == 3:
+            parts.append('\n'.join(f'> {inline_text(rng, 10, density)}' for _ in range(3)))
+        elif kind == 4:
+            parts.append('```\n' + '\n'.join(' '.join(rng.choices(WORDS, k=6)) for _ in range(4)) + '\n```')
+        else:
+            parts.append(inline_text(rng, 60, density))
+    return '\n\n'.join(parts) + '\n'
+
+def generate_content(root, pages, blocks, density, depth, seed=0):
+    rng = random.Random(seed)
+    for page in range(pages):
+        dir_path = root
+        for level in range(page % (depth + 1)):
+            dir_path = os.path.join(dir_path, f'section{(page + level) % 4}')
+        os.makedirs(dir_path, exist_ok=True)
+        with open(os.path.join(dir_path, f'page{page}.md'), 'w') as f:
+            f.write(markdown_page(rng, f'Page {page}', blocks, density))
+
+def clear_caches():
+    # Every repeat starts cold, so the numbers measure parsing and rendering rather than cache lookups
+    for cache in (frozen_block, cached_inline_html, cached_inline_text, frozen_leaf, frozen_parent):
+        cache.cache_clear()
+
+def inline_nodes(text):
+    return [text_node_to_html_node(node) for node in text_to_textnodes(text)]
+
+def unfrozen_html_node(markdown):
+    # The tree markdown_to_html_node would build from plain LeafNode and ParentNode objects, with no interning
+    # or HTML serialized ahead of time, so to_html does the full walk
+    children = []
+    for block_type, lines in iter_block_records(markdown.split('\n')):
+        texts = block_texts(block_type, lines)
+        match block_type:
+            case 'heading':
+                level = len(lines[0]) - len(lines[0].lstrip('#'))
+                children.append(ParentNode(inline_nodes(texts[0]) or [LeafNode('')], f'h{level}'))
+            case 'code':
+                children.append(ParentNode([ParentNode(inline_nodes(texts[0]), 'code')], 'pre'))
+            case 'quote':
+                children.append(ParentNode(inline_nodes(texts[0]), 'blockquote'))
+            case 'unordered_list' | 'ordered_list':
+                tag = 'ul' if block_type == 'unordered_list' else 'ol'
+                children.append(ParentNode([ParentNode(inline_nodes(text), 'li') for text in texts], tag))
+            case _:
+                children.append(ParentNode(inline_nodes(texts[0]), 'p'))
+    return ParentNode(children, 'div')
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times)}
+
+def read_sources(root):
+    sources = []
+    for dir_path, _, file_names in os.walk(root):
+        for name in sorted(file_names):
+            with open(os.path.join(dir_path, name)) as f:
+                sources.append(f.read())
+    return sources
+
+def cli_help():
+    # A fresh interpreter each time, so this is the start-up cost a user sees, imports included
+    subprocess.run([sys.executable, '-m', 'sitegen', '--help'], cwd=SRC_DIR, stdout=subprocess.DEVNULL, check=True)
+
+def run(args):
+    work = tempfile.mkdtemp(prefix='sitegen-bench-')
+    try:
+        content = os.path.join(work, 'content')
+        template = os.path.join(work, 'template.html')
+        with open(template, 'w') as f:
+            f.write(TEMPLATE)
+        generate_content(content, args.pages, args.blocks, args.density, args.depth, args.seed)
+
+        sources = read_sources(content)
+        blocks = [block for source in sources for block in markdown_to_blocks(source)]
+        inline = [BLOCK_MARKER.sub('', line) for block in blocks if not block.startswith('```') for line in block.split('\n')]
+        trees = [unfrozen_html_node(source) for source in sources]
+        if [tree.to_html() for tree in trees] != [markdown_to_html_node(source).to_html() for source in sources]:
+            raise Exception('unfrozen trees render different HTML than markdown_to_html_node')
+
+        def full_build():
+            dest = os.path.join(work, 'public')
+            shutil.rmtree(dest, ignore_errors=True)
+            with redirect_stdout(StringIO()):
+                generate_pages_recursive(content, template, dest, jobs=args.jobs)
+
+        results = {
+            'text_to_textnodes': timed(lambda: [text_to_textnodes(text) for text in inline], args.repeat),
+            'markdown_to_blocks': timed(lambda: [markdown_to_blocks(source) for source in sources], args.repeat),
+            'markdown_to_html_node': timed(lambda: [markdown_to_html_node(source) for source in sources], args.repeat),
+            'to_html': timed(lambda: [tree.to_html() for tree in trees], args.repeat),
+            'generate_pages_recursive': timed(full_build, args.repeat),
+            'cli_startup': timed(cli_help, args.repeat),
+        }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return {
+        'config': {
+            'pages': args.pages,
+            'blocks': args.blocks,
+            'density': args.density,
+            'depth': args.depth,
+            'seed': args.seed,
+            'jobs': args.jobs,
+            'repeat': args.repeat,
+        },
+        'bytes': sum(len(source) for source in sources),
+        'results': results,
+    }
+
+def compare(report, baseline, threshold):
+    regressions = []
+    if baseline['config'] != report['config']:
+        print('warning: baseline was recorded with a different config', file=sys.stderr)
+    for name, timing in report['results'].items():
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]['min']
+        new = timing['min']
+        change = (new - old) / old if old else 0
+        timing['baseline'] = old
+        timing['change'] = change
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parse, render and build pipeline on synthetic content')
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--blocks', type=int, default=30, help='blocks per page')
+    parser.add_argument('--density', type=float, default=0.3, help='fraction of words wrapped in inline markup')
+    parser.add_argument('--depth', type=int, default=3, help='maximum directory nesting depth')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes for the full build')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='compare against a saved report and fail on regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown against the baseline (0.2 is 20%%)')
+    parser.add_argument('--save-baseline', metavar='PATH', help='also save this report as a baseline')
+    args = parser.parse_args()
+
+    report = run(args)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report['regressions'] = regressions
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(output + '\n')
+    for name in regressions:
+        timing = report['results'][name]
+        print(f'regression: {name} {timing["change"]:+.0%} ({timing["baseline"]:.4f}s -> {timing["min"]:.4f}s)', file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench import clear_caches, unfrozen_html_node
+from sitegen.delimiter import markdown_to_html_node, text_to_textnodes
+from sitegen.htmlnode import LeafNode
+from sitegen.textnode import TextNode
+
+
+# Dict-backed copies of the node classes as they were before __slots__, for comparison
+class DictTextNode:
+    text = None
+    text_type = None
+    url = None
+
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    tag = None
+    value = None
+    children = None
+    props = None
+
+    def __init__(self, value, tag=None, props=None):
+        self.value = value
+        self.tag = tag
+        self.children = None
+        self.props = props
+
+
+def large_page(paragraphs):
+    block = 'Some **bold** words, an *italic* one, `code`, a [link](https://example.com) and ![img](/a.png) too.'
+    items = '\n'.join(f'* item {i} with **bold**' for i in range(10))
+    parts = ['# Large page']
+    for i in range(paragraphs):
+        parts.append(block)
+        parts.append(items)
+    return '\n\n'.join(parts)
+
+def measure(build):
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    objects = build()
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in end.compare_to(start, 'filename'))
+    return size, objects
+
+def per_node(cls, count, *args):
+    size, objects = measure(lambda: [cls(*args) for _ in range(count)])
+    return size / len(objects)
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare node memory use against dict-backed nodes')
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = [
+        ('TextNode', per_node(TextNode, args.nodes, 'text', 'bold', None), per_node(DictTextNode, args.nodes, 'text', 'bold', None)),
+        ('LeafNode', per_node(LeafNode, args.nodes, 'text', 'b', None), per_node(DictLeafNode, args.nodes, 'text', 'b', None)),
+    ]
+    print(f'{"node":<10}{"slots B/node":>14}{"dict B/node":>14}{"saved":>10}')
+    for name, slotted, legacy in rows:
+        print(f'{name:<10}{slotted:>14.1f}{legacy:>14.1f}{1 - slotted / legacy:>10.0%}')
+
+    markdown = large_page(args.paragraphs)
+    # The slot savings apply to plain nodes; the interned tree shares one node per repeated block instead
+    size, node = measure(lambda: unfrozen_html_node(markdown))
+    clear_caches()
+    frozen_size, _ = measure(lambda: markdown_to_html_node(markdown))
+    text_size, text_nodes = measure(lambda: [text_to_textnodes(line.removeprefix('* ')) for line in markdown.split('\n') if line])
+    text_count = sum(len(nodes) for nodes in text_nodes)
+    html_count = count_nodes(node)
+    saved = text_count * (rows[0][2] - rows[0][1]) + html_count * (rows[1][2] - rows[1][1])
+    print(f'page of {len(markdown)} bytes: {html_count} html nodes in {size / 1024:.0f} KiB, {text_count} text nodes in {text_size / 1024:.0f} KiB')
+    print(f'slots save about {saved / 1024:.0f} KiB on this page')
+    print(f'the interned tree of the same page takes {frozen_size / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
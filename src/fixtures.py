@@ -0,0 +1,20 @@
+# File helpers shared by the tests
+import os
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+def read_file(path):
+    with open(path) as f:
+        return f.read()
+
+def read_tree(root):
+    files = {}
+    for dir_path, _, file_names in os.walk(root):
+        for name in file_names:
+            path = os.path.join(dir_path, name)
+            files[os.path.relpath(path, root)] = read_file(path)
+    return files
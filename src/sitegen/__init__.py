@@ -0,0 +1,13 @@
+# Submodules load on first use, so importing the package or running the CLI stays cheap
+LAZY_EXPORTS = {
+    'Site': 'site',
+    'generate_pages_recursive': 'generate',
+    'markdown_to_html_node': 'delimiter',
+}
+
+
+def __getattr__(name):
+    if name not in LAZY_EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+    return getattr(import_module(f'.{LAZY_EXPORTS[name]}', __name__), name)
@@ -0,0 +1,78 @@
+import argparse
+
+from .settings import PROFILE_ENV, PROFILE_PATH, PUBLIC_DIR, SEARCH_DIR
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Generate the site in ./public from ./content and ./static')
+	parser.add_argument('command', nargs='?', choices=['build', 'watch', 'merge'], default='build', help='build once, build then serve ./public and rebuild on changes, or merge shard manifests')
+	parser.add_argument('manifests', nargs='*', help='shard manifests to merge (default: every shard manifest in ./.build)')
+	parser.add_argument('--incremental', action='store_true', help='only rebuild pages whose source or template changed since the last build')
+	parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N', help='render pages on N worker processes (0 uses every CPU)')
+	parser.add_argument('--profile', action='store_true', help=f'record per-stage timings for every page (or set {PROFILE_ENV}=1)')
+	parser.add_argument('--profile-output', default=PROFILE_PATH, metavar='PATH', help='where to write the JSON profile')
+	parser.add_argument('--clean', action='store_true', help='delete ./public before building')
+	parser.add_argument('--checksum', action='store_true', help='compare static files by content hash when their mtimes differ')
+	parser.add_argument('--hardlink', action='store_true', help='hardlink static files into ./public instead of copying them')
+	parser.add_argument('--no-cache', action='store_true', help='do not cache rendered Markdown between builds')
+	parser.add_argument('--cache-size', type=int, default=256, metavar='MB', help='size limit of the rendered Markdown cache')
+	parser.add_argument('--explain', action='store_true', help='print why each page is rebuilt')
+	parser.add_argument('--pipeline', action='store_true', help='overlap source reads and output writes with rendering on I/O threads')
+	parser.add_argument('--compress', action='store_true', help='write .gz (and .br or .zst when available) variants of text files in ./public')
+	parser.add_argument('--search', action='store_true', help=f'write a sharded full-text search index to ./{PUBLIC_DIR}/{SEARCH_DIR}')
+	parser.add_argument('--base-url', metavar='URL', help=f'absolute URL the site is served from; writes sitemap.xml and an Atom feed.xml to ./{PUBLIC_DIR}')
+	parser.add_argument('--shard', type=parse_shard, metavar='I/N', help='render only the I-th of N disjoint slices of the pages')
+	parser.add_argument('--port', type=int, default=8888, help='port for the watch mode server')
+	parser.add_argument('--interval', type=float, default=0.1, help='seconds between change polls in watch mode')
+	args = parser.parse_args(argv)
+	if args.jobs < 0:
+		parser.error('--jobs must be 0 or a positive number')
+	if args.pipeline and args.jobs != 1:
+		parser.error('--pipeline renders in this process and cannot be combined with --jobs')
+	if args.manifests and args.command != 'merge':
+		parser.error('manifest paths are only accepted by merge')
+	if args.shard and args.command == 'watch':
+		parser.error('--shard cannot be combined with watch')
+	if args.shard and args.search:
+		parser.error('--search needs every page; build the index from an unsharded run')
+	if args.shard and args.base_url:
+		parser.error('--base-url needs every page; write the sitemap and feed from an unsharded run')
+	if args.shard and args.clean:
+		parser.error('--clean would delete the output of other shards')
+	if args.shard and args.compress:
+		parser.error('--compress needs every page; compress ./public from an unsharded run after merging')
+	# Imported only once the arguments are valid, so --help and usage errors skip loading the generator
+	from .site import Site
+
+	site = Site(
+		incremental=args.incremental,
+		jobs=args.jobs,
+		profile=args.profile,
+		profile_output=args.profile_output,
+		clean=args.clean,
+		checksum=args.checksum,
+		hardlink=args.hardlink,
+		cache=not args.no_cache,
+		cache_size=args.cache_size,
+		explain=args.explain,
+		pipeline=args.pipeline,
+		compress=args.compress,
+		shard=args.shard,
+		search=args.search,
+		base_url=args.base_url,
+	)
+	if args.command == 'merge':
+		try:
+			site.merge(args.manifests)
+		except Exception as e:
+			parser.error(f'merge: {e}')
+		return
+	site.build()
+	if args.command == 'watch':
+		site.watch(args.port, args.interval)
+
+def parse_shard(value):
+	index, separator, count = value.partition('/')
+	if not separator or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+		raise argparse.ArgumentTypeError(f'expected I/N with 1 <= I <= N, got {value!r}')
+	return int(index), int(count)
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import os
+
+from .manifest import remove_output
+from .output import write_if_changed
+from .plan import ASSET, scan
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    zstd = None
+
+TEXT_SUFFIXES = ('.html', '.css', '.js', '.mjs', '.json', '.svg', '.xml', '.txt', '.map')
+VARIANT_SUFFIXES = ('.gz', '.br', '.zst')
+
+
+def gzip_bytes(data):
+    # mtime=0 keeps the output identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def brotli_bytes(data):
+    return brotli.compress(data, quality=11)
+
+def zstd_bytes(data):
+    if zstd is not None:
+        return zstd.compress(data, level=19)
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+def available_encoders():
+    encoders = {'.gz': gzip_bytes}
+    if brotli is not None:
+        encoders['.br'] = brotli_bytes
+    if zstd is not None or zstandard is not None:
+        encoders['.zst'] = zstd_bytes
+    return encoders
+
+def compress_file(path, mtime, suffixes, encoders):
+    with open(path, 'rb') as source_file:
+        data = source_file.read()
+    for suffix in suffixes:
+        variant = path + suffix
+        write_if_changed(variant, encoders[suffix](data))
+        # The variant carries its source's mtime, which is how the next build knows it is current
+        os.utime(variant, ns=(mtime, mtime))
+
+def compress_tree(root, encoders=None, threads=None, keep=()):
+    # keep holds paths copied from static/; they are compressed like any other text file, but a
+    # shipped variant such as index.css.gz or archive.tar.gz is never compressed over or removed
+    encoders = available_encoders() if encoders is None else encoders
+    keep = set(keep)
+    files = dict((entry.source, entry.mtime) for entry in scan(root, root, ASSET))
+    to_compress = []
+    unchanged = 0
+    removed = 0
+    for path, mtime in files.items():
+        base, suffix = os.path.splitext(path)
+        if suffix in VARIANT_SUFFIXES:
+            # Only a variant of a text file can be one of ours, e.g. a .tar.gz from static/ is left alone
+            if path not in keep and base.endswith(TEXT_SUFFIXES) and (suffix not in encoders or base not in files):
+                remove_output(path, root)
+                removed += 1
+            continue
+        if not path.endswith(TEXT_SUFFIXES):
+            continue
+        suffixes = [suffix for suffix in encoders if path + suffix not in keep]
+        stale = [suffix for suffix in suffixes if files.get(path + suffix) != mtime]
+        unchanged += len(suffixes) - len(stale)
+        if stale:
+            to_compress.append((path, mtime, stale))
+    # zlib and brotli release the GIL while compressing, so threads keep every core busy
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda job: compress_file(job[0], job[1], job[2], encoders), to_compress))
+    compressed = sum(len(stale) for _, _, stale in to_compress)
+    return {'compressed': compressed, 'unchanged': unchanged, 'removed': removed}
@@ -0,0 +1,361 @@
+from functools import lru_cache
+import re
+from .textnode import TextNode, text_node_to_html_node, TEXT_TYPES, TEXT_TYPE_TEXT, TEXT_TYPE_LINK, TEXT_TYPE_IMAGE
+from .htmlnode import HTMLNode, ParentNode, LeafNode, frozen_leaf, frozen_parent
+
+# Bump whenever the HTML produced for a given Markdown input changes; it keys the fragment cache
+PARSER_VERSION = 3
+INLINE_CACHE_SIZE = 8192
+# Longer spans are rendered every time; each cached entry holds its text and HTML
+INLINE_CACHE_LIMIT = 256
+BLOCK_CACHE_SIZE = 4096
+
+IMAGE_REGEX = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_REGEX = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
+# Delimiters split a text before images and links are found, and images before links, so an image or
+# link never holds a bracket, a delimiter or a line break, and a link URL never holds an image.
+# A stray [ then stays in the text in front of the link.
+INLINE_REGEX = re.compile(
+    r"!\[(?P<image_text>[^\[\]*`\n]*)\]\((?P<image>[^()*`\n]*)\)"
+    r"|(?<!!)\[(?P<link_text>[^\[\]*`\n]*)\]\((?P<link>(?:[^()*`\n!]|!(?!\[[^\[\]*`\n]*\]\([^()*`\n]*\)))*)\)"
+    r"|(?s:\*\*(?P<bold>.*?)\*\*)"
+    r"|(?s:\*(?!\*)(?P<italic>.*?)\*)"
+    r"|(?s:`(?P<code>.*?)`)"
+)
+
+def text_to_textnodes(text):
+    # One left-to-right scan; the leftmost construct wins, images and links before delimiters
+    nodes = []
+    position = 0
+    for match in INLINE_REGEX.finditer(text):
+        if match.start() > position:
+            nodes.append(plain_text_node(text[position:match.start()]))
+        text_type = match.lastgroup
+        if text_type == TEXT_TYPE_IMAGE or text_type == TEXT_TYPE_LINK:
+            alt_text = strip_link_text(match.group(text_type + '_text'))
+            nodes.append(TextNode(alt_text, text_type, strip_link_url(match.group(text_type))))
+        else:
+            nodes.append(TextNode(match.group(text_type), text_type))
+        position = match.end()
+    if position < len(text):
+        nodes.append(plain_text_node(text[position:]))
+    return nodes
+
+def plain_text_node(text):
+    for delimiter in ['**', '*', '`']:
+        if delimiter in text:
+            raise Exception(f'No closing delimiter found ({delimiter})')
+    return TextNode(text, TEXT_TYPE_TEXT)
+
+def split_nodes_delimiter(old_nodes, delimiter, text_type):
+    new_nodes = []
+    if text_type not in TEXT_TYPES:
+        raise Exception("Specified text_type not valid")
+    for node in old_nodes:
+        if node.text_type == TEXT_TYPE_TEXT:
+            regular_type = node.text_type
+            current_type = node.text_type
+            if node.text.count(delimiter) % 2 != 0:
+                raise Exception(f'No closing delimiter found ({delimiter})')
+            node_strings = node.text.split(delimiter)
+            if len(node_strings) == 1:
+                new_nodes.append(node)
+                continue
+            for string in node_strings:
+                new_node = TextNode(string, current_type)
+                new_nodes.append(new_node)
+                if current_type == regular_type:
+                    current_type = text_type
+                else:
+                    current_type = regular_type
+        elif node.text_type not in TEXT_TYPES:
+            raise Exception("Node type not valid")
+        else:
+            new_nodes.append(node)
+    return new_nodes
+
+def split_nodes_image(old_nodes):
+    return split_nodes_spans(old_nodes, extract_markdown_image_spans, TEXT_TYPE_IMAGE)
+
+def split_nodes_link(old_nodes):
+    return split_nodes_spans(old_nodes, extract_markdown_link_spans, TEXT_TYPE_LINK)
+
+def split_nodes_spans(old_nodes, extract_spans, text_type):
+    # Slice between match offsets so each text node is scanned once, however many links it holds
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TEXT_TYPE_TEXT:
+            new_nodes.append(node)
+            continue
+        position = 0
+        for start, end, text, url in extract_spans(node.text):
+            if start > position:
+                new_nodes.append(TextNode(node.text[position:start], TEXT_TYPE_TEXT))
+            new_nodes.append(TextNode(text, text_type, url))
+            position = end
+        if position < len(node.text):
+            new_nodes.append(TextNode(node.text[position:], TEXT_TYPE_TEXT))
+    return new_nodes
+
+def strip_link_text(text):
+    return text.replace('[', '').replace(']', '') if '[' in text or ']' in text else text
+
+def strip_link_url(url):
+    return url.replace('(', '').replace(')', '') if '(' in url or ')' in url else url
+
+def extract_spans(regex, text, opening):
+    spans = []
+    for match in regex.finditer(text):
+        start = match.start()
+        inner = match.group(1)
+        if '[' in inner and inner.rfind(opening) >= 0:
+            # The match can open at an earlier stray bracket; the real one is the last before the ](
+            start = match.start(1) + inner.rfind(opening)
+        spans.append((start, match.end(), strip_link_text(inner), strip_link_url(match.group(2))))
+    return spans
+
+def extract_markdown_image_spans(text):
+    return extract_spans(IMAGE_REGEX, text, '![')
+
+def extract_markdown_link_spans(text):
+    return extract_spans(LINK_REGEX, text, '[')
+
+def extract_markdown_images(text):
+    return [(alt_text, url) for _, _, alt_text, url in extract_markdown_image_spans(text)]
+
+def extract_markdown_links(text):
+    return [(link_text, url) for _, _, link_text, url in extract_markdown_link_spans(text)]
+
+def markdown_to_blocks(markdown):
+    return list(iter_markdown_blocks(markdown.split('\n')))
+
+def iter_markdown_blocks(lines):
+    for _, block_lines in iter_block_records(lines):
+        yield '\n'.join(block_lines)
+
+def markdown_to_block_records(markdown):
+    return list(iter_block_records(markdown.split('\n')))
+
+def iter_block_records(lines, fences=True):
+    # One pass over any iterable of lines, including an open file, yielding (block_type, lines)
+    # Blocks end at empty lines, except inside a ``` fence that opens a block
+    block_lines = []
+    fenced = False
+    for line in lines:
+        line = line.rstrip('\n')
+        if fenced:
+            block_lines.append(line)
+            fenced = not line.rstrip().endswith('```')
+        elif line:
+            block_lines.append(line)
+        elif block_lines:
+            trimmed = trim_block(block_lines)
+            if fences and trimmed and trimmed[0].startswith('```') and is_unclosed_fence(trimmed):
+                block_lines.append(line)
+                fenced = True
+                continue
+            if trimmed:
+                yield lines_to_block_type(trimmed), trimmed
+            block_lines = []
+    if fenced:
+        # Never closed: fall back to splitting the fence at empty lines like any other text
+        yield from iter_block_records(block_lines, False)
+        return
+    trimmed = block_lines and trim_block(block_lines)
+    if trimmed:
+        yield lines_to_block_type(trimmed), trimmed
+
+def trim_block(block_lines):
+    # The lines of '\n'.join(block_lines).strip(), only joining when there is whitespace to strip
+    if not block_lines[0][0].isspace() and not block_lines[-1][-1].isspace():
+        return block_lines
+    block = '\n'.join(block_lines).strip()
+    return block.split('\n') if block else None
+
+def is_unclosed_fence(lines):
+    if len(lines[0]) >= 6 and lines[0].endswith('```'):
+        return False
+    return not any(line.rstrip().endswith('```') for line in lines[1:])
+
+def block_to_block_type(block):
+    return lines_to_block_type(block.split('\n'))
+
+def lines_to_block_type(lines):
+    first = lines[0]
+    if first.startswith('#'):
+        level = len(first) - len(first.lstrip('#'))
+        if level > 6:
+            return 'paragraph'
+        if level == len(first):
+            return 'heading' if len(lines) == 1 else 'paragraph'
+        return 'heading' if first[level] == ' ' else 'paragraph'
+    elif first.startswith('```') and lines[-1].endswith('```'):
+        return 'code'
+    elif first.startswith('>'):
+        for line in lines:
+            if not line.startswith('>'):
+                return 'paragraph'
+        return 'quote'
+    elif first.startswith('* ') or first.startswith('- '):
+        prefix = first[:2]
+        for line in lines:
+            if not line.startswith(prefix):
+                return 'paragraph'
+        return 'unordered_list'
+    elif first.startswith('1. '):
+        for number, line in enumerate(lines, 1):
+            if not line.startswith(f'{number}. '):
+                return 'paragraph'
+        return 'ordered_list'
+    else:
+        return 'paragraph'
+
+def markdown_to_html_node(markdown):
+    children = [record_to_html_node(block_type, lines) for block_type, lines in iter_block_records(markdown.split('\n'))]
+    return ParentNode(children, 'div')
+
+def iter_markdown_html(lines):
+    return iter_records_html(iter_block_records(lines))
+
+def iter_records_html(records):
+    # Streamed blocks are plain nodes dropped once written; interning them would keep every block
+    # of a large page alive in the caches
+    records = iter(records)
+    first_record = next(records, None)
+    if first_record is None:
+        raise ValueError('Parent node has no children')
+    yield '<div>'
+    yield from record_to_plain_node(*first_record).iter_html()
+    for block_type, block_lines in records:
+        yield from record_to_plain_node(block_type, block_lines).iter_html()
+    yield '</div>'
+
+def record_to_plain_node(block_type, lines):
+    texts = block_texts(block_type, lines)
+    match block_type:
+        case 'heading':
+            level = len(lines[0]) - len(lines[0].lstrip('#'))
+            return ParentNode(text_to_plain_children(texts[0]) or [LeafNode('')], f'h{level}')
+        case 'code':
+            return ParentNode([ParentNode(text_to_plain_children(texts[0]), 'code')], 'pre')
+        case 'quote':
+            return ParentNode(text_to_plain_children(texts[0]), 'blockquote')
+        case 'unordered_list' | 'ordered_list':
+            items = [ParentNode(text_to_plain_children(text), 'li') for text in texts]
+            return ParentNode(items, 'ul' if block_type == 'unordered_list' else 'ol')
+        case _:
+            return ParentNode(text_to_plain_children(texts[0]), 'p')
+
+def text_to_plain_children(text):
+    if text == '':
+        return []
+    return [LeafNode(inline_to_html(text))]
+
+def record_to_html_node(block_type, lines):
+    return frozen_block(block_type, tuple(lines))
+
+@lru_cache(maxsize=BLOCK_CACHE_SIZE)
+def frozen_block(block_type, lines):
+    # Blocks repeated across pages (included partials, boilerplate) are parsed and serialized once
+    children = lines_to_children(block_type, lines)
+    if block_type == 'heading':
+        level = len(lines[0]) - len(lines[0].lstrip('#'))
+        return frozen_parent(children, f'h{level}')
+    return block_to_parent(block_type, children)
+
+def inline_to_html(text):
+    # Repeated spans are short (nav links, list items, boilerplate), and a long paragraph is rarely seen twice
+    if len(text) > INLINE_CACHE_LIMIT:
+        return render_inline_html(text)
+    return cached_inline_html(text)
+
+@lru_cache(maxsize=INLINE_CACHE_SIZE)
+def cached_inline_html(text):
+    return render_inline_html(text)
+
+def render_inline_html(text):
+    return ''.join([text_node_to_html_node(node).to_html() for node in text_to_textnodes(text)])
+
+def inline_cache_stats():
+    info = cached_inline_html.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+def text_to_html_children(text):
+    # Repeated spans (nav links, list items, boilerplate) render once and are reused as raw HTML leaves
+    if text == '':
+        return ()
+    return (frozen_leaf(inline_to_html(text)),)
+
+def text_to_children(block, block_type):
+    return lines_to_children(block_type, block.split('\n'))
+
+def block_texts(block_type, lines):
+    # The inline text of a block with its block markup removed: one entry per list item, otherwise one
+    match block_type:
+        case 'heading':
+            return ['\n'.join(lines).lstrip('#').lstrip(' ')]
+        case 'code':
+            return ['\n'.join(lines).lstrip('`').rstrip('`')]
+        case 'quote':
+            return ['\n'.join(lines).replace('> ', '')]
+        case 'unordered_list':
+            texts = []
+            for line in lines:
+                if line == '':
+                    continue
+                if line[0] == '-':
+                    line = line.removeprefix('- ')
+                if line[0] == '*':
+                    line = line.removeprefix('* ')
+                texts.append(line)
+            return texts
+        case 'ordered_list':
+            return [line.lstrip(f'{counter}. ') for counter, line in enumerate(lines, 1)]
+        case 'paragraph':
+            return ['\n'.join(lines)]
+        case _:
+            raise Exception('block_texts received invalid block type')
+
+def lines_to_children(block_type, lines):
+    texts = block_texts(block_type, lines)
+    match block_type:
+        case 'heading':
+            # An empty heading such as '###' still renders as <h3></h3>
+            return text_to_html_children(texts[0]) or (frozen_leaf(''),)
+        case 'code':
+            return (frozen_parent(text_to_html_children(texts[0]), 'code'),)
+        case 'unordered_list' | 'ordered_list':
+            return tuple([frozen_parent(text_to_html_children(text), 'li') for text in texts])
+        case _:
+            return text_to_html_children(texts[0])
+
+def inline_to_text(text):
+    if len(text) > INLINE_CACHE_LIMIT:
+        return render_inline_text(text)
+    return cached_inline_text(text)
+
+@lru_cache(maxsize=INLINE_CACHE_SIZE)
+def cached_inline_text(text):
+    return render_inline_text(text)
+
+def render_inline_text(text):
+    # Alt text of images counts as text; link targets and markup do not
+    return ''.join([node.text for node in text_to_textnodes(text)])
+
+def record_to_text(block_type, lines):
+    return '\n'.join([inline_to_text(text) for text in block_texts(block_type, lines)])
+
+def block_to_parent(block_type, children):
+    match block_type:
+        case 'code':
+            return frozen_parent(children, 'pre')
+        case 'quote':
+            return frozen_parent(children, 'blockquote')
+        case 'unordered_list':
+            return frozen_parent(children, 'ul')
+        case 'ordered_list':
+            return frozen_parent(children, 'ol')
+        case 'paragraph':
+            return frozen_parent(children, 'p')
+        case _:
+            raise Exception("Block type not found")
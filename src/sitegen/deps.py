@@ -0,0 +1,69 @@
+import os
+import re
+
+INCLUDE_REGEX = re.compile(r'\{\{>\s*(\S+?)\s*\}\}')
+TEMPLATE_NAME = 'template.html'
+
+
+def is_partial(name):
+    # Partials are only ever pulled into other pages, never rendered on their own
+    return name.startswith('_')
+
+def include_path(line, from_path):
+    match = INCLUDE_REGEX.fullmatch(line.strip())
+    if match is None:
+        return None
+    return os.path.normpath(os.path.join(os.path.dirname(from_path), match.group(1)))
+
+def expand_lines(lines, from_path, included=None, stack=()):
+    # A line holding only {{> path }} is replaced by the lines of that file, relative to the including file
+    stack = stack + (from_path,)
+    for line in lines:
+        path = include_path(line, from_path) if '{{>' in line else None
+        if path is None:
+            yield line
+            continue
+        if path in stack:
+            raise Exception(f'Include cycle: {" -> ".join(stack + (path,))}')
+        if not os.path.isfile(path):
+            raise Exception(f'Included file {path} not found in {from_path}')
+        if included is not None:
+            included.add(path)
+        previous = None
+        with open(path) as include_file:
+            for included_line in expand_lines(include_file, path, included, stack):
+                if previous is not None:
+                    yield previous
+                previous = included_line
+        if previous is not None:
+            if line.endswith('\n') and not previous.endswith('\n'):
+                previous += '\n'
+            yield previous
+
+def expand_includes(markdown, from_path, included=None):
+    if '{{>' not in markdown:
+        return markdown
+    return ''.join(expand_lines(markdown.splitlines(keepends=True), from_path, included))
+
+def find_includes(from_path):
+    included = set()
+    try:
+        with open(from_path) as from_file:
+            expand_includes(from_file.read(), from_path, included)
+    except Exception:
+        # Missing includes and cycles are reported when the page is rendered
+        pass
+    return sorted(included)
+
+def find_template(dir_path, content_root, default, found):
+    # found maps each directory to its nearest template so every directory is checked once per build
+    if dir_path not in found:
+        candidate = os.path.join(dir_path, TEMPLATE_NAME)
+        parent = os.path.dirname(dir_path)
+        if os.path.isfile(candidate):
+            found[dir_path] = candidate
+        elif os.path.normpath(dir_path) == os.path.normpath(content_root) or parent == dir_path:
+            found[dir_path] = default
+        else:
+            found[dir_path] = find_template(parent, content_root, default, found)
+    return found[dir_path]
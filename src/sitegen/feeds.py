@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from html import escape
+import json
+import os
+
+from .output import write_if_changed, write_json
+
+METADATA_VERSION = 1
+FEED_ENTRIES = 20
+SITEMAP_NAME = 'sitemap.xml'
+FEED_NAME = 'feed.xml'
+
+
+def new_metadata():
+    return {'version': METADATA_VERSION, 'pages': {}}
+
+def load_metadata(path):
+    # Title, URL and dates of every page, so sitemap and feed never need to re-read content/
+    try:
+        with open(path) as metadata_file:
+            metadata = json.load(metadata_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return new_metadata()
+    if not isinstance(metadata, dict) or metadata.get('version') != METADATA_VERSION:
+        return new_metadata()
+    return metadata
+
+def save_metadata(metadata, path):
+    write_json(path, metadata, indent=1, sort_keys=True)
+
+def update_metadata(metadata, changed, sources):
+    # changed maps re-read sources to their metadata; pages missing from sources are dropped
+    pages = dict((source, page) for source, page in metadata['pages'].items() if source in sources)
+    pages.update(changed)
+    metadata['pages'] = pages
+    return metadata
+
+def timestamp(mtime_ns):
+    return datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def normalize_date(value):
+    # Front matter dates are YYYY-MM-DD or an ISO 8601 time; None for anything Atom could not carry
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def published(page):
+    return normalize_date(page.get('date')) or page['updated']
+
+def absolute_url(base_url, url):
+    return base_url.rstrip('/') + url
+
+def sitemap_xml(metadata, base_url):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for page in sorted(metadata['pages'].values(), key=lambda page: page['url']):
+        lines.append(f'  <url><loc>{escape(absolute_url(base_url, page["url"]))}</loc><lastmod>{page["updated"]}</lastmod></url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+def atom_feed(metadata, base_url, limit=FEED_ENTRIES):
+    pages = sorted(metadata['pages'].values(), key=lambda page: (published(page), page['url']), reverse=True)[:limit]
+    home = [page for page in metadata['pages'].values() if page['url'] == '/']
+    title = home[0]['title'] if home else base_url
+    updated = max([page['updated'] for page in metadata['pages'].values()], default=timestamp(0))
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f'  <title>{escape(title)}</title>',
+        f'  <id>{escape(absolute_url(base_url, "/"))}</id>',
+        f'  <link href="{escape(absolute_url(base_url, "/"))}"/>',
+        f'  <link rel="self" href="{escape(absolute_url(base_url, "/" + FEED_NAME))}"/>',
+        f'  <updated>{updated}</updated>',
+    ]
+    for page in pages:
+        url = absolute_url(base_url, page['url'])
+        lines.append('  <entry>')
+        lines.append(f'    <title>{escape(page["title"])}</title>')
+        lines.append(f'    <id>{escape(url)}</id>')
+        lines.append(f'    <link href="{escape(url)}"/>')
+        lines.append(f'    <published>{escape(published(page))}</published>')
+        lines.append(f'    <updated>{escape(page["updated"])}</updated>')
+        lines.append('  </entry>')
+    lines.append('</feed>')
+    return '\n'.join(lines) + '\n'
+
+def write_feeds(metadata, dest_dir, base_url):
+    written = write_if_changed(os.path.join(dest_dir, SITEMAP_NAME), sitemap_xml(metadata, base_url).encode())
+    written += write_if_changed(os.path.join(dest_dir, FEED_NAME), atom_feed(metadata, base_url).encode())
+    return written
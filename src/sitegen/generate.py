@@ -0,0 +1,314 @@
+from concurrent import futures
+from contextlib import nullcontext
+from itertools import chain, repeat
+import os
+
+from .deps import expand_includes, expand_lines, find_template
+from .feeds import load_metadata, normalize_date, save_metadata, timestamp, update_metadata, write_feeds
+from .delimiter import inline_cache_stats, iter_block_records, iter_records_html, markdown_to_block_records, markdown_to_html_node, record_to_html_node, record_to_text
+from .htmlnode import ParentNode
+from .output import discard, replace_if_changed, write_if_changed
+from .manifest import load_manifest, plan_pages, remove_output, save_manifest
+from .pipeline import read_text, run_pipeline
+from .plan import PAGE, scan
+from .profiler import PageProfile
+from .search import load_store, page_text, page_url, records_text, save_store, term_positions, update_store, write_index
+from .settings import SEARCH_DIR
+from .template import load_template
+
+# Sources above this size are streamed to the output instead of going through the fragment cache,
+# which needs the whole source and its HTML in memory
+STREAM_BYTES = 1024 * 1024
+
+
+def extract_title(markdown):
+	if not markdown.startswith('# '):
+		raise Exception('Markdown has no h1 header')
+	return markdown.split('\n', 1)[0].lstrip('# ')
+
+def read_front_matter(lines):
+	# Takes any iterable of lines and returns the metadata and an iterator over the lines after it
+	lines = iter(lines)
+	first_line = next(lines, '')
+	if first_line.rstrip('\n') != '---':
+		return {}, chain([first_line], lines)
+	metadata = {}
+	for line in lines:
+		if line.rstrip('\n') == '---':
+			break
+		key, separator, value = line.partition(':')
+		if separator:
+			metadata[key.strip()] = value.strip()
+	return metadata, lines
+
+def split_front_matter(markdown):
+	metadata, lines = read_front_matter(markdown.splitlines(keepends=True))
+	return metadata, ''.join(lines)
+
+def page_variables(metadata, title, content):
+	variables = dict(metadata)
+	variables['Title'] = title
+	variables['Content'] = content
+	return variables
+
+def render_page(markdown, template, cache=None, info=None, text=False):
+	# info, when given, is filled with the title and front matter, and with text the page text for search
+	metadata, markdown = split_front_matter(markdown)
+	title = extract_title(markdown)
+	if info is not None:
+		info.update(title=title, metadata=metadata)
+		if text:
+			info['text'] = page_text(markdown)
+	if cache is None:
+		html_string = markdown_to_html_node(markdown).to_html()
+	else:
+		key = cache.key(markdown)
+		html_string = cache.get(key)
+		if html_string is None:
+			html_string = markdown_to_html_node(markdown).to_html()
+			cache.put(key, html_string)
+	return template.render(page_variables(metadata, title, html_string))
+
+def write_output(dest_path, page):
+	return write_if_changed(dest_path, page.encode())
+
+def write_page_cached(from_path, template, dest_path, cache, info=None, text=False):
+	page = render_page(expand_includes(read_text(from_path), from_path), template, cache, info, text)
+	os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+	return write_output(dest_path, page)
+
+def tap_text(records, texts):
+	# Collects the search text of each block as it streams past
+	for block_type, lines in records:
+		texts.append(record_to_text(block_type, lines))
+		yield block_type, lines
+
+def write_page(from_path, template, dest_path, info=None, text=False):
+	# Stream the page block by block so large sources are never held in memory whole
+	from_file = open(from_path)
+	try:
+		# Includes are expanded first, as render_page does, so an included title or front matter counts
+		metadata, lines = read_front_matter(expand_lines(from_file, from_path))
+		first_line = next(lines, '')
+		title = extract_title(first_line)
+		records = iter_block_records(chain([first_line], lines))
+		texts = []
+		if info is not None and text:
+			records = tap_text(records, texts)
+		variables = page_variables(metadata, title, iter_records_html(records))
+		os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+		tmp_path = dest_path + '.tmp'
+		try:
+			with open(tmp_path, 'w') as dest_file:
+				template.write(dest_file, variables)
+		except BaseException:
+			discard(tmp_path)
+			raise
+		if info is not None:
+			info.update(title=title, metadata=metadata)
+			if text:
+				info['text'] = '\n'.join(texts)
+		return replace_if_changed(tmp_path, dest_path)
+	finally:
+		from_file.close()
+
+def write_page_profiled(from_path, template, dest_path, profile, info=None, text=False):
+	inline_cache = inline_cache_stats()
+	with profile.stage('read'):
+		metadata, markdown = split_front_matter(expand_includes(read_text(from_path), from_path))
+	with profile.stage('blocks'):
+		records = markdown_to_block_records(markdown)
+	with profile.stage('inline'):
+		html_node = ParentNode([record_to_html_node(block_type, lines) for block_type, lines in records], 'div')
+	with profile.stage('html'):
+		html_string = html_node.to_html()
+	profile.counters['inline_cache_hits'] = inline_cache_stats()['hits'] - inline_cache['hits']
+	profile.counters['inline_cache_misses'] = inline_cache_stats()['misses'] - inline_cache['misses']
+	with profile.stage('template'):
+		title = extract_title(markdown)
+		page = template.render(page_variables(metadata, title, html_string))
+	if info is not None:
+		info.update(title=title, metadata=metadata)
+		if text:
+			with profile.stage('text'):
+				info['text'] = records_text(records)
+	with profile.stage('write'):
+		os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+		return write_output(dest_path, page)
+
+def build_page(from_path, template, dest_path, profile=False, cache=None, search=False):
+	# The title and front matter of the page, and with search its text, come back with the result,
+	# so the sitemap, feed and search index never parse the page a second time
+	page_profile = PageProfile(from_path) if profile else None
+	page_info = {}
+	try:
+		if page_profile:
+			written = write_page_profiled(from_path, template, dest_path, page_profile, page_info, search)
+		elif cache and os.path.getsize(from_path) <= STREAM_BYTES:
+			written = write_page_cached(from_path, template, dest_path, cache, page_info, search)
+		else:
+			written = write_page(from_path, template, dest_path, page_info, search)
+	except Exception as e:
+		return format_error(e), page_profile and page_profile.to_dict(), False, None
+	return None, page_profile and page_profile.to_dict(), written, page_info
+
+def format_error(error):
+	return f'{type(error).__name__}: {error}'
+
+def build_pages(pages, templates, jobs=1, profile=False, cache=None, pipeline=False, search=()):
+	# Each page is (source, destination, template path); templates maps template paths to loaded templates.
+	# Pages whose source is in search also return their text for the search index.
+	if pipeline and not profile:
+		page_templates = dict((page[0], templates[page[2]]) for page in pages)
+		infos = dict((page[0], {}) for page in pages)
+		render = lambda from_path, markdown: render_page(expand_includes(markdown, from_path), page_templates[from_path], cache, infos[from_path], from_path in search)
+		written = {}
+
+		def write(dest_path, page):
+			written[dest_path] = write_output(dest_path, page)
+
+		for page, error in run_pipeline(pages, render, write):
+			yield page, (error and format_error(error), None, written.get(page[1], False), None if error else infos[page[0]])
+	elif jobs > 1 and len(pages) > 1:
+		sources = [page[0] for page in pages]
+		dests = [page[1] for page in pages]
+		page_templates = [templates[page[2]] for page in pages]
+		page_search = [page[0] in search for page in pages]
+		chunksize = max(1, len(pages) // (jobs * 4))
+		with futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+			yield from zip(pages, executor.map(build_page, sources, page_templates, dests, repeat(profile), repeat(cache), page_search, chunksize=chunksize))
+	else:
+		for page in pages:
+			yield page, build_page(page[0], templates[page[2]], page[1], profile, cache, page[0] in search)
+
+def generate_page(from_path, template_path, dest_path):
+	print(f'Generating page from {from_path} to {dest_path} using {template_path}')
+	write_page(from_path, load_template(template_path), dest_path)
+
+def search_key(entry):
+	# The hashes of a page and its includes; the template never changes the text of a page
+	return [entry['source']] + [entry['deps'][path] for path in sorted(entry['deps']) if path != entry['template']]
+
+def search_pages(entries, store):
+	return set(from_path for from_path, entry in entries.items()
+		if from_path not in store['pages'] or store['pages'][from_path].get('key') != search_key(entry))
+
+def read_page_info(from_path, text=False):
+	# Only for pages a store misses that were not rendered in this build
+	metadata, markdown = split_front_matter(expand_includes(read_text(from_path), from_path))
+	page_info = {'title': extract_title(markdown), 'metadata': metadata}
+	if text:
+		page_info['text'] = page_text(markdown)
+	return page_info
+
+def rendered_or_read(from_path, infos, text=False):
+	# The page info returned by the render, or read from the source; None, with the error reported, if that fails
+	page_info = infos.get(from_path)
+	if page_info is not None and (not text or 'text' in page_info):
+		return page_info
+	try:
+		return read_page_info(from_path, text)
+	except Exception as e:
+		print(f'Error reading {from_path}: {format_error(e)}')
+		return None
+
+def index_page(entry, page_info, dest_dir_path):
+	return {'url': page_url(entry['output'], dest_dir_path), 'title': page_info['title'], 'terms': term_positions(page_info['text']), 'key': search_key(entry)}
+
+def update_search_index(entries, infos, store, store_path, dest_dir_path):
+	# Only pages whose source or includes changed since they were stored are tokenised again, in any build mode;
+	# infos holds the title and text returned by the pages rendered in this build
+	indexed = {}
+	for from_path in sorted(search_pages(entries, store)):
+		page_info = rendered_or_read(from_path, infos, True)
+		if page_info is not None:
+			indexed[from_path] = index_page(entries[from_path], page_info, dest_dir_path)
+	update_store(store, indexed, entries)
+	stats = write_index(store, os.path.join(dest_dir_path, SEARCH_DIR))
+	save_store(store, store_path)
+	print(f'Search index: {stats["pages"]} pages ({len(indexed)} tokenised) in {stats["shards"]} shards, {stats["written"]} files written, {stats["removed"]} removed')
+
+def page_metadata(from_path, page_info, entry, dest_dir_path):
+	# Front matter and the title are all a sitemap or feed needs
+	page = {'url': page_url(entry['output'], dest_dir_path), 'title': page_info['title'], 'updated': timestamp(entry['mtime'])}
+	date = page_info['metadata'].get('date')
+	if date and normalize_date(date):
+		page['date'] = normalize_date(date)
+	elif date:
+		print(f'Ignoring date {date!r} in {from_path}, expected YYYY-MM-DD or an ISO 8601 time')
+	return page
+
+def update_feeds(entries, infos, store_path, dest_dir_path, base_url):
+	metadata = load_metadata(store_path)
+	changed = {}
+	for from_path, entry in entries.items():
+		if from_path in infos or from_path not in metadata['pages']:
+			page_info = rendered_or_read(from_path, infos)
+			if page_info is not None:
+				changed[from_path] = page_metadata(from_path, page_info, entry, dest_dir_path)
+	update_metadata(metadata, changed, entries)
+	if base_url:
+		written = write_feeds(metadata, dest_dir_path, base_url)
+		print(f'Sitemap and feed: {len(metadata["pages"])} pages ({len(changed)} updated), {written} files written')
+	save_metadata(metadata, store_path)
+
+def discover_pages(dir_path_content, dest_dir_path):
+	return scan(dir_path_content, dest_dir_path, PAGE)
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, manifest_path=None, incremental=False, jobs=1, profile=None, cache=None, pipeline=False, pages=None, explain=False, search_store=None, metadata_store=None, base_url=None):
+	# A template.html in a content directory overrides template_path for every page below it
+	found_templates = {}
+	page_template = lambda from_path: find_template(os.path.dirname(from_path), dir_path_content, template_path, found_templates)
+
+	with profile.stage('plan') if profile else nullcontext():
+		manifest = load_manifest(manifest_path)
+		if pages is None:
+			pages = discover_pages(dir_path_content, dest_dir_path)
+		to_render, stale, entries, reasons = plan_pages(pages, page_template, manifest, incremental)
+		templates = dict((path, load_template(path)) for path in sorted(set(page[2] for page in to_render)))
+		store = load_store(search_store) if search_store else None
+		search = search_pages(entries, store) if store else set()
+
+	failed = []
+	written = 0
+	with profile.stage('pages') if profile else nullcontext():
+		results = list(build_pages(to_render, templates, jobs, profile is not None, cache, pipeline, search))
+	infos = {}
+	for (from_path, dest_path, page_template_path), (error, page_profile, page_written, page_info) in results:
+		if explain:
+			print(f'Rebuilding {from_path}: {reasons[from_path]}')
+		print(f'Generating page from {from_path} to {dest_path} using {page_template_path}')
+		if profile:
+			profile.add_page(page_profile)
+		if error:
+			print(f'Error generating page from {from_path}: {error}')
+			failed.append(from_path)
+			del entries[from_path]
+		written += page_written
+		if page_info is not None:
+			infos[from_path] = page_info
+	for dest_path in stale:
+		print(f'Removing {dest_path}, its source no longer exists')
+		remove_output(dest_path, dest_dir_path)
+	if incremental:
+		print(f'{len(to_render)} of {len(pages)} pages rebuilt, {len(stale)} removed')
+	print(f'Output files: {written} written, {len(to_render) - len(failed) - written} unchanged')
+	if profile:
+		profile.counters['pages_rendered'] = len(to_render)
+		profile.counters['pages_total'] = len(pages)
+		profile.counters['pages_written'] = written
+
+	if search_store:
+		with profile.stage('search') if profile else nullcontext():
+			update_search_index(entries, infos, store, search_store, dest_dir_path)
+	if metadata_store:
+		with profile.stage('feeds') if profile else nullcontext():
+			update_feeds(entries, infos, metadata_store, dest_dir_path, base_url)
+
+	manifest['pages'] = entries
+	if manifest_path:
+		save_manifest(manifest, manifest_path)
+	if cache:
+		cache.prune()
+	if failed:
+		raise Exception(f'{len(failed)} of {len(to_render)} pages failed to build')
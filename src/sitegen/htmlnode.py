@@ -0,0 +1,148 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+INTERN_CACHE_SIZE = 16384
+
+_END = object()
+
+
+class HTMLNode:
+    __slots__ = ('value', 'tag', 'children', 'props')
+
+    def __init__(self, value=None, tag=None, children=None, props=None):
+        self.value = value
+        self.tag = tag
+        self.children = children
+        self.props = props
+    
+    def to_html(self):
+        raise NotImplementedError()
+
+    def iter_html(self):
+        yield self.to_html()
+
+    def write_html(self, fp):
+        fp.writelines(self.iter_html())
+
+    def props_to_html(self):
+        if not self.props:
+            return ''
+        return ''.join([' ' + prop + '=' + self.props[prop] for prop in self.props])
+
+    def __repr__(self):
+        outStr = ''
+        outStr += f'Tag: {self.tag}\n'
+        outStr += f'Value: {self.value}\n'
+        outStr += f'Children: {self.children}\n'
+        outStr += f'Props:{self.props_to_html()}'
+        return outStr
+
+
+class LeafNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, value, tag=None, props=None):
+        super().__init__(value, tag, None, props)
+
+    def to_html(self):
+        if self.value == None:
+            raise ValueError('Leaf node has no value')
+        if self.tag == None:
+            return self.value
+        return f'<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>'
+    
+
+class ParentNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, children, tag=None, props=None):
+        super().__init__(None, tag, children, props)
+
+    def to_html(self):
+        return ''.join(self.iter_html())
+
+    def open_tag(self):
+        if self.tag == None:
+            raise ValueError('Parent node has no tag')
+        if not self.children:
+            raise ValueError('Parent node has no children')
+        return f'<{self.tag}{self.props_to_html()}>'
+
+    def iter_html(self):
+        # Walk the tree with an explicit stack so deep nesting can't hit the recursion limit
+        yield self.open_tag()
+        stack = [(self.tag, iter(self.children))]
+        while stack:
+            tag, children = stack[-1]
+            child = next(children, _END)
+            if child is _END:
+                stack.pop()
+                yield f'</{tag}>'
+            elif isinstance(child, ParentNode):
+                yield child.open_tag()
+                stack.append((child.tag, iter(child.children)))
+            else:
+                yield child.to_html()
+
+
+class FrozenNode(HTMLNode):
+    # Immutable, so its HTML is serialized once at construction and shared by every tree it appears in
+    __slots__ = ('html',)
+
+    def __init__(self, value, tag, children, props, html):
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'tag', tag)
+        object.__setattr__(self, 'children', children)
+        object.__setattr__(self, 'props', props)
+        object.__setattr__(self, 'html', html)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenNode is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenNode is immutable')
+
+    def to_html(self):
+        return self.html
+
+    def iter_html(self):
+        yield self.html
+
+
+# Interning: equal arguments return the same node while it stays in the cache. Children are
+# themselves interned, so they hash by identity and a key never walks the subtree below it.
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def frozen_leaf(value, tag=None, props=None):
+    if tag is None and value is not None:
+        # Raw HTML leaves, the common case for rendered inline text
+        return FrozenNode(value, None, None, None, value)
+    props = MappingProxyType(dict(props)) if props else None
+    return FrozenNode(value, tag, None, props, LeafNode(value, tag, props).to_html())
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def frozen_parent(children, tag=None, props=None):
+    props = MappingProxyType(dict(props)) if props else None
+    open_tag = ParentNode(children, tag, props).open_tag()
+    return FrozenNode(None, tag, children, props, f'{open_tag}{"".join([child.html for child in children])}</{tag}>')
+
+def freeze(node):
+    # Post-order walk with an explicit stack, so every child is frozen before its parent
+    frozen = {}
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if isinstance(current, ParentNode):
+            pending = [child for child in current.children or () if not isinstance(child, FrozenNode) and id(child) not in frozen]
+            if pending:
+                stack.extend(pending)
+                continue
+        stack.pop()
+        if isinstance(current, FrozenNode) or id(current) in frozen:
+            continue
+        props = tuple(current.props.items()) if current.props else None
+        if isinstance(current, ParentNode):
+            children = tuple(child if isinstance(child, FrozenNode) else frozen[id(child)] for child in current.children or ())
+            frozen[id(current)] = frozen_parent(children, current.tag, props)
+        else:
+            frozen[id(current)] = frozen_leaf(current.value, current.tag, props)
+    return node if isinstance(node, FrozenNode) else frozen[id(node)]
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import re
+import stat
+
+from .deps import find_includes
+from .output import write_json
+
+MANIFEST_VERSION = 2
+SHARD_MANIFEST_REGEX = re.compile(r'\.shard-(\d+)-of-(\d+)\.json$')
+
+_manifest_cache = {}
+_hash_cache = {}
+
+
+def new_manifest():
+    return {'version': MANIFEST_VERSION, 'pages': {}, 'static': {}}
+
+def load_manifest(path):
+    # Long-lived processes such as watch mode keep the parsed manifest until the file changes
+    if path is None or not os.path.exists(path):
+        return new_manifest()
+    stat = os.stat(path)
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    with open(path) as manifest_file:
+        try:
+            manifest = json.load(manifest_file)
+        except json.JSONDecodeError:
+            return new_manifest()
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return new_manifest()
+    manifest.setdefault('static', {})
+    _manifest_cache[path] = ((stat.st_mtime_ns, stat.st_size), manifest)
+    return manifest
+
+def save_manifest(manifest, path):
+    write_json(path, manifest, indent=1, sort_keys=True)
+    stat = os.stat(path)
+    _manifest_cache[path] = ((stat.st_mtime_ns, stat.st_size), manifest)
+
+def shard_manifest_path(path, index, count):
+    return f'{path.removesuffix(".json")}.shard-{index}-of-{count}.json'
+
+def merge_manifests(paths):
+    if not paths:
+        raise Exception('No shard manifests to merge')
+    shards = {}
+    for path in paths:
+        match = SHARD_MANIFEST_REGEX.search(path)
+        if match is None:
+            raise Exception(f'{path} is not a shard manifest')
+        shards[int(match.group(1)), int(match.group(2))] = path
+    counts = sorted(set(count for _, count in shards))
+    if len(counts) != 1:
+        raise Exception(f'Shard manifests come from different shard counts: {counts}')
+    count = counts[0]
+    missing = [index for index in range(1, count + 1) if (index, count) not in shards]
+    if missing:
+        raise Exception(f'Missing manifests for shards {missing} of {count}')
+    merged = new_manifest()
+    for (index, _), path in sorted(shards.items()):
+        manifest = load_manifest(path)
+        merged['pages'].update(manifest['pages'])
+        # Only the first shard syncs static files
+        if index == 1:
+            merged['static'] = manifest['static']
+    return merged
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+def stat_hash(path):
+    # Like the manifest and templates, a file is hashed again only once its size or mtime changes
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+    key = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    digest = hash_file(path)
+    _hash_cache[path] = (key, digest)
+    return digest
+
+def current_hash(path, hashes):
+    if path not in hashes:
+        hashes[path] = stat_hash(path)
+    return hashes[path]
+
+def rebuild_reason(old, dest, source_hash, template, hashes):
+    if old is None:
+        return 'new page'
+    if old['source'] != source_hash:
+        return 'source changed'
+    if old['output'] != dest:
+        return 'output path changed'
+    if old['template'] != template:
+        return f'template is now {template}'
+    for path, dep_hash in sorted(old['deps'].items()):
+        current = current_hash(path, hashes)
+        if current is None:
+            return f'{path} was removed'
+        if current != dep_hash:
+            return f'{path} changed'
+    if not os.path.exists(dest):
+        return 'output is missing'
+    return None
+
+def plan_pages(pages, templates, manifest, incremental=True):
+    # templates maps a source path to the template that renders it
+    old_pages = manifest['pages']
+    entries = {}
+    to_render = []
+    reasons = {}
+    hashes = {}
+    for page in pages:
+        src, dest = page.source, page.dest
+        old = old_pages.get(src)
+        # Unchanged size and mtime means the stored hash is still good; skip reading the file
+        if old and old['mtime'] == page.mtime and old['size'] == page.size:
+            source_hash = old['source']
+        else:
+            source_hash = hash_file(src)
+        template = templates(src)
+        reason = rebuild_reason(old, dest, source_hash, template, hashes) if incremental else 'full build'
+        if reason is None:
+            deps = old['deps']
+        else:
+            to_render.append((src, dest, template))
+            reasons[src] = reason
+            old_includes = old and [path for path in old['deps'] if path != old['template']]
+            if old and old['source'] == source_hash and all(current_hash(path, hashes) == old['deps'][path] for path in old_includes):
+                includes = old_includes
+            else:
+                includes = find_includes(src)
+            deps = dict((path, current_hash(path, hashes)) for path in [template] + includes)
+        entries[src] = {
+            'source': source_hash,
+            'template': template,
+            'deps': deps,
+            'output': dest,
+            'mtime': page.mtime,
+            'size': page.size,
+        }
+    outputs = set(entry['output'] for entry in entries.values())
+    stale = []
+    for src, entry in old_pages.items():
+        if src not in entries and entry['output'] not in outputs:
+            stale.append(entry['output'])
+    return to_render, stale, entries, reasons
+
+def remove_output(path, root):
+    if os.path.exists(path):
+        os.remove(path)
+    root = os.path.abspath(root)
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent.startswith(root + os.sep) and os.path.isdir(parent) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
@@ -0,0 +1,54 @@
+import filecmp
+import json
+import os
+
+
+def same_contents(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as existing:
+            return existing.read() == data
+    except FileNotFoundError:
+        return False
+
+def write_if_changed(path, data):
+    # Identical files keep their mtime, so rsync and CDN upload diffs skip them
+    if same_contents(path, data):
+        return False
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as tmp_file:
+            tmp_file.write(data)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return True
+
+def write_json(path, value, **options):
+    # The temp name is unique per process, so builds sharing a root never rename each other's file
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as tmp_file:
+            json.dump(value, tmp_file, **options)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+def discard(tmp_path):
+    # A half-written temp file must never be left behind in the output tree
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+def replace_if_changed(tmp_path, path):
+    if os.path.isfile(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
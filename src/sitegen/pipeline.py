@@ -0,0 +1,49 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+
+def read_text(path):
+    with open(path) as text_file:
+        return text_file.read()
+
+def make_dirs(paths):
+    # One makedirs per distinct directory instead of an exists check per file
+    for dir_path in sorted(set(os.path.dirname(path) for path in paths)):
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+def run_pipeline(pages, render, write, prefetch=16, readers=4, writers=4):
+    make_dirs([page[1] for page in pages])
+    write_slots = threading.BoundedSemaphore(writers * 2)
+    results = []
+    with ThreadPoolExecutor(max_workers=readers) as read_pool, ThreadPoolExecutor(max_workers=writers) as write_pool:
+        pending_pages = iter(pages)
+        reads = deque()
+
+        def prefetch_sources():
+            while len(reads) < prefetch:
+                page = next(pending_pages, None)
+                if page is None:
+                    return
+                reads.append((page, read_pool.submit(read_text, page[0])))
+
+        prefetch_sources()
+        while reads:
+            page, read_future = reads.popleft()
+            prefetch_sources()
+            try:
+                output = render(page[0], read_future.result())
+            except Exception as e:
+                results.append((page, None, e))
+                continue
+            # Bound the number of rendered pages waiting on disk so memory stays flat
+            write_slots.acquire()
+            write_future = write_pool.submit(write, page[1], output)
+            write_future.add_done_callback(lambda _: write_slots.release())
+            results.append((page, write_future, None))
+    for page, write_future, error in results:
+        if write_future is not None:
+            error = write_future.exception()
+        yield page, error
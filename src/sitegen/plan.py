@@ -0,0 +1,58 @@
+from collections import namedtuple
+import json
+import os
+import zlib
+
+from .deps import is_partial
+from .output import write_json
+
+PAGE = 'page'
+ASSET = 'asset'
+
+PlanEntry = namedtuple('PlanEntry', ['source', 'dest', 'kind', 'mtime', 'size'])
+
+
+def scan(root, dest_root, kind):
+    # DirEntry caches the file type from the directory listing, so each file costs a single stat
+    entries = []
+    stack = [(root, dest_root)]
+    while stack:
+        dir_path, dest_dir = stack.pop()
+        with os.scandir(dir_path) as dir_entries:
+            for entry in dir_entries:
+                if kind == PAGE and is_partial(entry.name):
+                    continue
+                dest = os.path.join(dest_dir, entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, dest))
+                elif not entry.is_file():
+                    continue
+                elif kind == ASSET:
+                    stat = entry.stat()
+                    entries.append(PlanEntry(entry.path, dest, kind, stat.st_mtime_ns, stat.st_size))
+                elif entry.name.endswith('.md'):
+                    stat = entry.stat()
+                    entries.append(PlanEntry(entry.path, dest.removesuffix('.md') + '.html', kind, stat.st_mtime_ns, stat.st_size))
+    entries.sort(key=lambda entry: entry.source.split(os.sep))
+    return entries
+
+def build_plan(content_dir, static_dir, dest_dir):
+    return scan(content_dir, dest_dir, PAGE) + scan(static_dir, dest_dir, ASSET)
+
+def entries_of_kind(plan, kind):
+    return [entry for entry in plan if entry.kind == kind]
+
+def shard_index(source, root, count):
+    # crc32 of the root-relative path is stable across processes, hosts and platforms, unlike hash()
+    rel_path = os.path.relpath(source, root).replace(os.sep, '/')
+    return zlib.crc32(rel_path.encode()) % count + 1
+
+def shard_entries(entries, root, index, count):
+    return [entry for entry in entries if shard_index(entry.source, root, count) == index]
+
+def save_plan(plan, path):
+    write_json(path, [entry._asdict() for entry in plan], indent=1)
+
+def load_plan(path):
+    with open(path) as plan_file:
+        return [PlanEntry(**entry) for entry in json.load(plan_file)]
@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+import json
+import os
+import sys
+import time
+
+from .settings import PROFILE_ENV
+
+PAGE_STAGES = ('read', 'blocks', 'inline', 'html', 'template', 'write')
+
+
+def profile_requested(flag):
+    return flag or os.environ.get(PROFILE_ENV, '') not in ('', '0')
+
+@contextmanager
+def timed_stage(stages, name):
+    # net_blocks is the change in live interpreter memory blocks across the stage: memory the stage kept,
+    # not how many allocations it made, which Python cannot count cheaply
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        net_blocks = sys.getallocatedblocks() - blocks
+        stage = stages.setdefault(name, {'seconds': 0.0, 'net_blocks': 0})
+        stage['seconds'] += seconds
+        stage['net_blocks'] += net_blocks
+
+
+class PageProfile:
+    def __init__(self, path):
+        self.path = path
+        self.stages = {}
+        self.counters = {}
+
+    def stage(self, name):
+        return timed_stage(self.stages, name)
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'seconds': sum(stage['seconds'] for stage in self.stages.values()),
+            'stages': self.stages,
+            'counters': self.counters,
+        }
+
+
+class BuildProfile:
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+        self.counters = {}
+
+    def stage(self, name):
+        return timed_stage(self.stages, name)
+
+    def add_page(self, page):
+        if page is not None:
+            self.pages.append(page)
+            for name, value in page['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def page_stage_totals(self):
+        totals = {}
+        for page in self.pages:
+            for name, stage in page['stages'].items():
+                total = totals.setdefault(name, {'seconds': 0.0, 'net_blocks': 0})
+                total['seconds'] += stage['seconds']
+                total['net_blocks'] += stage['net_blocks']
+        return totals
+
+    def to_dict(self):
+        return {
+            'build_stages': self.stages,
+            'page_stages': self.page_stage_totals(),
+            'pages': self.pages,
+            'counters': self.counters,
+        }
+
+    def summary(self, top=10):
+        lines = ['Build stages:']
+        for name, stage in sorted(self.stages.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f'  {name:<12}{stage["seconds"]:>10.4f}s')
+        # Profiled pages are read and rendered whole, without the fragment cache or the streaming writer
+        lines.append(f'Page stages ({len(self.pages)} pages, rendered in memory without the fragment cache or streaming):')
+        for name, stage in sorted(self.page_stage_totals().items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f'  {name:<12}{stage["seconds"]:>10.4f}s{stage["net_blocks"]:>+12} net memory blocks')
+        lines.append('Slowest pages:')
+        for page in sorted(self.pages, key=lambda page: -page['seconds'])[:top]:
+            slowest = max(page['stages'].items(), key=lambda item: item[1]['seconds'])[0]
+            lines.append(f'  {page["seconds"]:>10.4f}s  {page["path"]} (mostly {slowest})')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'{name}: {value}')
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=1)
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+
+from .delimiter import markdown_to_block_records, record_to_text
+from .manifest import remove_output
+from .output import write_if_changed, write_json
+
+SEARCH_VERSION = 1
+SHARD_BYTES = 32 * 1024
+TERM_REGEX = re.compile(r'\w+')
+SHARD_REGEX = re.compile(r'terms-\d+\.json$')
+
+
+def tokenize(text):
+    return TERM_REGEX.findall(text.lower())
+
+def page_text(markdown):
+    return records_text(markdown_to_block_records(markdown))
+
+def records_text(records):
+    return '\n'.join([record_to_text(block_type, lines) for block_type, lines in records])
+
+def term_positions(text):
+    positions = {}
+    for position, term in enumerate(tokenize(text)):
+        positions.setdefault(term, []).append(position)
+    return positions
+
+def page_url(dest, root):
+    return '/' + os.path.relpath(dest, root).replace(os.sep, '/').removesuffix('index.html')
+
+def new_store():
+    return {'version': SEARCH_VERSION, 'pages': {}}
+
+def load_store(path):
+    # Per-page postings from earlier builds, so unchanged pages are never tokenised again
+    try:
+        with open(path) as store_file:
+            store = json.load(store_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return new_store()
+    if not isinstance(store, dict) or store.get('version') != SEARCH_VERSION:
+        return new_store()
+    return store
+
+def save_store(store, path):
+    write_json(path, store, separators=(',', ':'), sort_keys=True)
+
+def update_store(store, indexed, sources):
+    # indexed maps freshly tokenised sources to {url, title, terms}; pages missing from sources are dropped
+    pages = dict((source, page) for source, page in store['pages'].items() if source in sources)
+    # Page ids stay stable across builds, so a changed page only touches the shards holding its terms
+    used = set(page['id'] for page in pages.values())
+    free_id = 0
+    for source in sorted(indexed):
+        if source in pages:
+            page_id = pages[source]['id']
+        else:
+            while free_id in used:
+                free_id += 1
+            page_id = free_id
+            used.add(page_id)
+        pages[source] = dict(indexed[source], id=page_id)
+    store['pages'] = pages
+    return store
+
+def build_index(store, shard_bytes=SHARD_BYTES):
+    page_list = [None] * (max([page['id'] for page in store['pages'].values()], default=-1) + 1)
+    postings = {}
+    for page in store['pages'].values():
+        page_list[page['id']] = {'url': page['url'], 'title': page['title']}
+        for term, positions in page['terms'].items():
+            # Each posting is [page id, position, position, ...]
+            postings.setdefault(term, []).append([page['id']] + positions)
+    shards = []
+    shard = {}
+    size = 0
+    for term in sorted(postings):
+        term_postings = sorted(postings[term])
+        term_size = len(json.dumps(term)) + len(json.dumps(term_postings, separators=(',', ':'))) + 2
+        if shard and size + term_size > shard_bytes:
+            shards.append(shard)
+            shard = {}
+            size = 0
+        shard[term] = term_postings
+        size += term_size
+    if shard:
+        shards.append(shard)
+    return page_list, shards
+
+def json_bytes(value):
+    return json.dumps(value, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode()
+
+def write_index(store, dest_dir, shard_bytes=SHARD_BYTES):
+    # Shards cover sorted, disjoint term ranges; a client binary-searches index.json for the one it needs
+    page_list, shards = build_index(store, shard_bytes)
+    os.makedirs(dest_dir, exist_ok=True)
+    files = {'pages.json': json_bytes(page_list)}
+    shard_list = []
+    for number, shard in enumerate(shards):
+        name = f'terms-{number}.json'
+        files[name] = json_bytes(shard)
+        terms = sorted(shard)
+        shard_list.append({'file': name, 'first': terms[0], 'last': terms[-1]})
+    files['index.json'] = json_bytes({'version': SEARCH_VERSION, 'pages': 'pages.json', 'shards': shard_list})
+    written = 0
+    for name, data in files.items():
+        written += write_if_changed(os.path.join(dest_dir, name), data)
+    removed = 0
+    for entry in os.scandir(dest_dir):
+        if SHARD_REGEX.fullmatch(entry.name) and entry.name not in files:
+            remove_output(entry.path, dest_dir)
+            removed += 1
+    return {'pages': len(store['pages']), 'shards': len(shards), 'written': written, 'removed': removed}
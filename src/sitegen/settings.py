@@ -0,0 +1,13 @@
+# Default site layout, relative to the site root. Kept free of imports so the CLI can read it cheaply.
+CONTENT_DIR = 'content'
+STATIC_DIR = 'static'
+PUBLIC_DIR = 'public'
+TEMPLATE_PATH = 'template.html'
+MANIFEST_PATH = './.build/manifest.json'
+PLAN_PATH = './.build/plan.json'
+CACHE_DIR = './.build/fragments'
+PROFILE_PATH = './.build/profile.json'
+SEARCH_STORE_PATH = './.build/search.json'
+METADATA_PATH = './.build/pages.json'
+SEARCH_DIR = 'search'
+PROFILE_ENV = 'SITEGEN_PROFILE'
@@ -0,0 +1,118 @@
+from contextlib import nullcontext
+import glob
+import os
+import shutil
+
+from .cache import FragmentCache
+from .compress import compress_tree
+from .generate import generate_pages_recursive
+from .manifest import merge_manifests, save_manifest, shard_manifest_path
+from .plan import ASSET, PAGE, build_plan, entries_of_kind, save_plan, scan, shard_entries
+from .profiler import BuildProfile, profile_requested
+from .settings import CACHE_DIR, CONTENT_DIR, MANIFEST_PATH, METADATA_PATH, PLAN_PATH, PROFILE_PATH, PUBLIC_DIR, SEARCH_STORE_PATH, STATIC_DIR, TEMPLATE_PATH
+from .sync import sync_static
+
+
+class Site:
+    # One Site can build() any number of times; parsed templates, manifests, file hashes and rendered
+    # blocks are cached per process, so every build after the first only pays for what changed
+    def __init__(self, root='', incremental=False, jobs=1, profile=False, profile_output=None, clean=False, checksum=False, hardlink=False,
+                 cache=True, cache_size=256, explain=False, pipeline=False, compress=False, shard=None, search=False, base_url=None):
+        if jobs < 0:
+            raise ValueError('jobs must be 0 or a positive number')
+        if pipeline and jobs != 1:
+            raise ValueError('pipeline renders in this process and cannot be combined with jobs')
+        if shard and (clean or search or base_url or compress):
+            raise ValueError('a shard cannot clean or compress the output or write the search index, sitemap or feed')
+        self.root = root
+        self.content_dir = os.path.join(root, CONTENT_DIR)
+        self.static_dir = os.path.join(root, STATIC_DIR)
+        self.public_dir = os.path.join(root, PUBLIC_DIR)
+        self.template_path = os.path.join(root, TEMPLATE_PATH)
+        self.manifest_path = os.path.join(root, MANIFEST_PATH)
+        self.plan_path = os.path.join(root, PLAN_PATH)
+        self.profile_output = profile_output or os.path.join(root, PROFILE_PATH)
+        self.search_store = os.path.join(root, SEARCH_STORE_PATH) if search else None
+        self.metadata_store = os.path.join(root, METADATA_PATH) if base_url else None
+        self.incremental = incremental
+        self.jobs = jobs or os.cpu_count() or 1
+        self.profile = profile
+        self.clean = clean
+        self.checksum = checksum
+        self.hardlink = hardlink
+        self.cache = FragmentCache(os.path.join(root, CACHE_DIR), cache_size * 1024 * 1024) if cache else None
+        self.explain = explain
+        self.pipeline = pipeline
+        self.compress = compress
+        self.shard = shard
+        self.base_url = base_url
+
+    def build(self):
+        profile = BuildProfile() if profile_requested(self.profile) else None
+        # Each shard keeps its own manifest so shards never overwrite each other's state
+        manifest_path = shard_manifest_path(self.manifest_path, *self.shard) if self.shard else self.manifest_path
+        if self.clean and os.path.exists(self.public_dir):
+            shutil.rmtree(self.public_dir)
+        with profile.stage('scan') if profile else nullcontext():
+            plan = build_plan(self.content_dir, self.static_dir, self.public_dir)
+            save_plan(plan, self.plan_path)
+            pages = entries_of_kind(plan, PAGE)
+            if self.shard:
+                pages = shard_entries(pages, self.content_dir, *self.shard)
+                print(f'Shard {self.shard[0]}/{self.shard[1]}: {len(pages)} of {len(entries_of_kind(plan, PAGE))} pages')
+        if self.shard and self.shard[0] != 1:
+            print('Static files: synced by shard 1')
+        else:
+            with profile.stage('static') if profile else nullcontext():
+                self.sync_static(manifest_path, entries_of_kind(plan, ASSET))
+        try:
+            self.generate(manifest_path, self.incremental, profile, pages)
+            if self.compress:
+                with profile.stage('compress') if profile else nullcontext():
+                    self.compress_public(entries_of_kind(plan, ASSET))
+        finally:
+            if profile:
+                print(profile.summary())
+                profile.dump(self.profile_output)
+                print(f'Profile written to {self.profile_output}')
+
+    def sync_static(self, manifest_path, assets=None):
+        stats = sync_static(self.static_dir, self.public_dir, manifest_path, self.checksum, self.hardlink, assets=assets)
+        print(f'Static files: {stats["copied"]} copied, {stats["unchanged"]} unchanged, {stats["removed"]} removed')
+
+    def generate(self, manifest_path, incremental, profile=None, pages=None):
+        generate_pages_recursive(self.content_dir, self.template_path, self.public_dir, manifest_path, incremental, self.jobs, profile, self.cache,
+                                 self.pipeline, pages, self.explain, self.search_store, self.metadata_store, self.base_url)
+
+    def compress_public(self, assets=None):
+        if assets is None:
+            assets = scan(self.static_dir, self.public_dir, ASSET)
+        stats = compress_tree(self.public_dir, keep=[asset.dest for asset in assets])
+        print(f'Compressed files: {stats["compressed"]} written, {stats["unchanged"]} unchanged, {stats["removed"]} removed')
+
+    def merge(self, paths=None):
+        paths = paths or sorted(glob.glob(shard_manifest_path(self.manifest_path, '*', '*')))
+        manifest = merge_manifests(paths)
+        save_manifest(manifest, self.manifest_path)
+        print(f'Merged {len(paths)} shard manifests into {self.manifest_path}: {len(manifest["pages"])} pages, {len(manifest["static"])} static files')
+
+    def watch(self, port=8888, interval=0.1):
+        # The HTTP server is only needed here, so plain builds never import it
+        from .watch import LiveReload, serve, watch
+
+        live_reload = LiveReload()
+        server = serve(self.public_dir, port, live_reload)
+        print(f'Serving {self.public_dir} at http://localhost:{port}/ and watching for changes')
+
+        def rebuild(changed):
+            if any(path.startswith(self.static_dir + os.sep) for path in changed):
+                self.sync_static(self.manifest_path)
+            if any(path == self.template_path or path.startswith(self.content_dir + os.sep) for path in changed):
+                self.generate(self.manifest_path, True)
+            if self.compress:
+                self.compress_public()
+
+        try:
+            watch([self.content_dir, self.static_dir, self.template_path], rebuild, live_reload, interval)
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import shutil
+
+from .manifest import load_manifest, remove_output, save_manifest
+from .plan import ASSET, scan
+
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_unchanged(asset, checksum=False):
+    try:
+        dest_stat = os.stat(asset.dest)
+    except FileNotFoundError:
+        return False
+    if dest_stat.st_size != asset.size:
+        return False
+    if dest_stat.st_mtime_ns == asset.mtime:
+        return True
+    if checksum and file_digest(asset.source) == file_digest(asset.dest):
+        # Same bytes: adopt the source mtime so the next sync can skip hashing
+        os.utime(asset.dest, ns=(dest_stat.st_atime_ns, asset.mtime))
+        return True
+    return False
+
+def reflink(src_file, dest_file):
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+    except OSError:
+        return False
+    return True
+
+def copy_range(src_file, dest_file, size):
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    copied = 0
+    try:
+        while copied < size:
+            count = os.copy_file_range(src_file.fileno(), dest_file.fileno(), size - copied)
+            if count == 0:
+                break
+            copied += count
+    except OSError:
+        if copied:
+            raise
+        return False
+    return copied == size
+
+def copy_file(src, dest, link=False):
+    # Never write through an existing dest: it may be a hardlink to the source
+    if os.path.lexists(dest):
+        os.remove(dest)
+    if link:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    size = os.path.getsize(src)
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        if not reflink(src_file, dest_file) and not copy_range(src_file, dest_file, size):
+            shutil.copyfileobj(src_file, dest_file)
+    shutil.copystat(src, dest)
+
+def sync_dir(src, dest, previous=None, checksum=False, link=False, threads=None, assets=None):
+    if assets is None:
+        assets = scan(src, dest, ASSET)
+    entries = {}
+    to_copy = []
+    dest_dirs = set()
+    for asset in assets:
+        rel_path = os.path.relpath(asset.source, src)
+        entries[rel_path] = {'size': asset.size, 'mtime': asset.mtime}
+        if not is_unchanged(asset, checksum):
+            to_copy.append((asset.source, asset.dest))
+            dest_dirs.add(os.path.dirname(asset.dest))
+    for dir_path in sorted(dest_dirs):
+        os.makedirs(dir_path, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda paths: copy_file(paths[0], paths[1], link), to_copy))
+    removed = []
+    for rel_path in sorted(previous or {}):
+        if rel_path not in entries:
+            remove_output(os.path.join(dest, rel_path), dest)
+            removed.append(rel_path)
+    return entries, {'copied': len(to_copy), 'unchanged': len(entries) - len(to_copy), 'removed': len(removed)}
+
+def sync_static(src, dest, manifest_path=None, checksum=False, link=False, threads=None, assets=None):
+    manifest = load_manifest(manifest_path)
+    entries, stats = sync_dir(src, dest, manifest['static'], checksum, link, threads, assets)
+    manifest['static'] = entries
+    if manifest_path:
+        save_manifest(manifest, manifest_path)
+    return stats
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import re
+
+PLACEHOLDER_REGEX = re.compile(r'(\{\{\s*(\w+)\s*\}\})')
+
+_template_cache = {}
+
+
+class Template:
+    def __init__(self, source):
+        self.source = source
+        self.hash = hashlib.sha256(source.encode()).hexdigest()
+        parts = PLACEHOLDER_REGEX.split(source)
+        # split() alternates literal, raw placeholder, name, literal, ...
+        self.literals = parts[0::3]
+        self.placeholders = list(zip(parts[2::3], parts[1::3]))
+        self.names = [name for name, _ in self.placeholders]
+
+    def __repr__(self):
+        return f'Template({self.names})'
+
+    def render(self, variables):
+        out = [self.literals[0]]
+        for (name, raw), literal in zip(self.placeholders, self.literals[1:]):
+            out.append(variables.get(name, raw))
+            out.append(literal)
+        return ''.join(out)
+
+    def write(self, fp, variables):
+        # Values may be iterables of chunks, which are streamed straight to fp
+        variables = dict(variables)
+        fp.write(self.literals[0])
+        for (name, raw), literal in zip(self.placeholders, self.literals[1:]):
+            value = variables.get(name, raw)
+            if isinstance(value, str):
+                fp.write(value)
+            elif self.names.count(name) > 1:
+                value = variables[name] = ''.join(value)
+                fp.write(value)
+            else:
+                fp.writelines(value)
+            fp.write(literal)
+
+
+def load_template(path):
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _template_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    with open(path) as template_file:
+        template = Template(template_file.read())
+    _template_cache[path] = (key, template)
+    return template
@@ -0,0 +1,40 @@
+from .htmlnode import LeafNode, ParentNode
+
+TEXT_TYPE_TEXT = 'text'
+TEXT_TYPE_BOLD = 'bold'
+TEXT_TYPE_ITALIC = 'italic'
+TEXT_TYPE_CODE = 'code'
+TEXT_TYPE_LINK = 'link'
+TEXT_TYPE_IMAGE = 'image'
+TEXT_TYPES = (TEXT_TYPE_TEXT, TEXT_TYPE_BOLD, TEXT_TYPE_ITALIC, TEXT_TYPE_CODE, TEXT_TYPE_LINK, TEXT_TYPE_IMAGE)
+
+TEXT_TYPE_TAGS = {
+	TEXT_TYPE_TEXT: None,
+	TEXT_TYPE_BOLD: 'b',
+	TEXT_TYPE_ITALIC: 'i',
+	TEXT_TYPE_CODE: 'code',
+}
+
+class TextNode:
+	__slots__ = ('text', 'text_type', 'url')
+
+	def __init__(self, text, text_type, url=None):
+		self.text = text
+		self.text_type = text_type
+		self.url = url
+
+	def __eq__(self, node):
+		return node.text == self.text and node.text_type == self.text_type and node.url == self.url
+
+	def __repr__(self):
+		return f"TextNode({self.text}, {self.text_type}, {self.url})"
+	
+def text_node_to_html_node(text_node):
+	text_type = text_node.text_type
+	if text_type in TEXT_TYPE_TAGS:
+		return LeafNode(text_node.text, TEXT_TYPE_TAGS[text_type], None)
+	if text_type == TEXT_TYPE_LINK:
+		return LeafNode(text_node.text, "a", {'href': text_node.url})
+	if text_type == TEXT_TYPE_IMAGE:
+		return LeafNode('', "img", {'src': text_node.url, 'alt': text_node.text})
+	raise Exception()
@@ -0,0 +1,128 @@
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_SCRIPT = f"<script>new EventSource('{LIVE_RELOAD_PATH}').onmessage = function () {{ location.reload(); }};</script>"
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+def inject_live_reload(html):
+    index = html.rfind('</body>')
+    if index == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:index] + LIVE_RELOAD_SCRIPT + html[index:]
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, live_reload=None, **kwargs):
+        self.live_reload = live_reload
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url_path = self.path.split('?', 1)[0].split('#', 1)[0]
+        if url_path == LIVE_RELOAD_PATH:
+            self.send_events()
+            return
+        path = self.translate_path(self.path)
+        if url_path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if not path.endswith('.html') or not os.path.isfile(path):
+            super().do_GET()
+            return
+        with open(path) as html_file:
+            body = inject_live_reload(html_file.read()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        version = self.live_reload.version
+        try:
+            while True:
+                new_version = self.live_reload.wait(version, 15)
+                if new_version != version:
+                    version = new_version
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(directory, port, live_reload):
+    handler = partial(DevRequestHandler, directory=directory, live_reload=live_reload)
+    server = ThreadingHTTPServer(('', port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for dir_path, _, file_names in os.walk(path):
+            for name in file_names:
+                file_path = os.path.join(dir_path, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                files[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def changed_paths(old, new):
+    changed = set(path for path in new if old.get(path) != new[path])
+    changed.update(path for path in old if path not in new)
+    return changed
+
+def watch(paths, rebuild, live_reload=None, interval=0.1):
+    previous = snapshot(paths)
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = changed_paths(previous, current)
+        if not changed:
+            continue
+        previous = current
+        start = time.perf_counter()
+        try:
+            rebuild(changed)
+        except Exception as e:
+            print(f'Rebuild failed: {e}')
+            continue
+        print(f'Rebuilt {len(changed)} changed file(s) in {(time.perf_counter() - start) * 1000:.0f}ms')
+        if live_reload:
+            live_reload.notify()
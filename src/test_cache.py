@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sitegen.cache import FragmentCache
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = FragmentCache(os.path.join(self.tmp.name, 'fragments'), 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_put(self):
+        key = self.cache.key('# Title')
+        self.assertEqual(key, self.cache.key('# Title'))
+        self.assertNotEqual(key, self.cache.key('# Other'))
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, '<h1>Title</h1>')
+        self.assertEqual(self.cache.get(key), '<h1>Title</h1>')
+
+    def test_prune_least_recently_used(self):
+        keys = [self.cache.key(str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, 'x' * 40)
+            os.utime(self.cache.path(key), ns=(i * 10**9, i * 10**9))
+        self.cache.get(keys[0])
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_prune_skips_vanished_files(self):
+        for i in range(3):
+            self.cache.put(self.cache.key(str(i)), 'x' * 40)
+        scandir = os.scandir
+
+        def vanishing_scandir(path):
+            # Another build removes every fragment between the listing and the stat
+            entries = list(scandir(path))
+            if path != self.cache.directory:
+                for entry in entries:
+                    os.remove(entry.path)
+            return iter(entries)
+
+        with mock.patch('os.scandir', vanishing_scandir):
+            self.assertEqual(self.cache.prune(), 0)
+
+    def test_prune_missing_directory(self):
+        self.assertEqual(self.cache.prune(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
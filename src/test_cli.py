@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestCLI(unittest.TestCase):
+    # Start-up time itself is reported by bench/bench.py as cli_startup, where a baseline catches regressions
+    def test_imports_are_lazy(self):
+        code = 'import sys, sitegen.cli; print(" ".join(sorted(sys.modules)))'
+        modules = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True, check=True).stdout.split()
+        self.assertEqual([name for name in modules if name.startswith('sitegen')], ['sitegen', 'sitegen.cli', 'sitegen.settings'])
+        for name in ('concurrent.futures', 'hashlib', 'http.server', 'json'):
+            self.assertNotIn(name, modules)
+
+    def test_usage_error(self):
+        result = subprocess.run([sys.executable, '-m', 'sitegen', '--jobs', '-1'], cwd=SRC_DIR, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn('--jobs must be 0 or a positive number', result.stderr)
+
+    def test_shard_compress_and_empty_merge_rejected(self):
+        with tempfile.TemporaryDirectory() as root:
+            env = dict(os.environ, PYTHONPATH=SRC_DIR)
+            for args, message in ((['--shard', '1/2', '--compress'], '--compress needs every page'), (['merge'], 'merge: No shard manifests to merge')):
+                result = subprocess.run([sys.executable, '-m', 'sitegen'] + args, cwd=root, env=env, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 2)
+                self.assertIn(message, result.stderr)
+                self.assertNotIn('Traceback', result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
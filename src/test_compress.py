@@ -0,0 +1,68 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from fixtures import write_file
+from sitegen.compress import available_encoders, compress_tree, gzip_bytes
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.page = os.path.join(self.root, 'blog', 'index.html')
+        write_file(self.page, '<p>hello</p>' * 100)
+        write_file(os.path.join(self.root, 'index.css'), 'body {}')
+        write_file(os.path.join(self.root, 'logo.png'), 'not text')
+        self.encoders = {'.gz': gzip_bytes}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_text_files_compressed(self):
+        stats = compress_tree(self.root, self.encoders)
+        self.assertEqual(stats, {'compressed': 2, 'unchanged': 0, 'removed': 0})
+        with gzip.open(self.page + '.gz', 'rt') as f:
+            self.assertEqual(f.read(), '<p>hello</p>' * 100)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'logo.png.gz')))
+        self.assertEqual(os.stat(self.page + '.gz').st_mtime_ns, os.stat(self.page).st_mtime_ns)
+
+    def test_unchanged_files_skipped(self):
+        compress_tree(self.root, self.encoders)
+        self.assertEqual(compress_tree(self.root, self.encoders), {'compressed': 0, 'unchanged': 2, 'removed': 0})
+        write_file(self.page, '<p>changed</p>')
+        self.assertEqual(compress_tree(self.root, self.encoders)['compressed'], 1)
+        with gzip.open(self.page + '.gz', 'rt') as f:
+            self.assertEqual(f.read(), '<p>changed</p>')
+
+    def test_stale_variants_removed(self):
+        compress_tree(self.root, self.encoders)
+        os.remove(self.page)
+        write_file(os.path.join(self.root, 'old.js.br'), '')
+        stats = compress_tree(self.root, self.encoders)
+        self.assertEqual(stats['removed'], 2)
+        self.assertEqual(sorted(os.listdir(self.root)), ['index.css', 'index.css.gz', 'logo.png'])
+
+    def test_static_variants_kept(self):
+        archive = os.path.join(self.root, 'archive.tar.gz')
+        shipped = os.path.join(self.root, 'index.css.gz')
+        write_file(archive, 'not ours')
+        write_file(shipped, 'shipped')
+        write_file(os.path.join(self.root, 'gone.css.gz'), 'shipped')
+        keep = [archive, shipped, os.path.join(self.root, 'gone.css.gz')]
+        for _ in range(2):
+            stats = compress_tree(self.root, self.encoders, keep=keep)
+            self.assertEqual(stats['removed'], 0)
+        with open(shipped) as f:
+            self.assertEqual(f.read(), 'shipped')
+        self.assertTrue(os.path.exists(archive))
+        self.assertTrue(os.path.exists(self.page + '.gz'))
+
+    def test_gzip_always_available(self):
+        self.assertIn('.gz', available_encoders())
+        self.assertEqual(gzip_bytes(b'abc'), gzip_bytes(b'abc'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from fixtures import write_file
+from sitegen.deps import expand_includes, find_includes, find_template
+
+
+class TestIncludes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.page = os.path.join(self.root, 'page.md')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_nested_includes(self):
+        write_file(os.path.join(self.root, '_a.md'), 'a\n{{> parts/_b.md }}')
+        write_file(os.path.join(self.root, 'parts', '_b.md'), 'b')
+        included = set()
+        markdown = expand_includes('# Page\n{{> _a.md }}\nend', self.page, included)
+        self.assertEqual(markdown, '# Page\na\nb\nend')
+        self.assertEqual(included, {os.path.join(self.root, '_a.md'), os.path.join(self.root, 'parts', '_b.md')})
+
+    def test_inline_include_left_alone(self):
+        self.assertEqual(expand_includes('see {{> _a.md }} here', self.page), 'see {{> _a.md }} here')
+
+    def test_missing_and_cyclic_includes(self):
+        self.assertRaises(Exception, expand_includes, '{{> _missing.md }}', self.page)
+        write_file(os.path.join(self.root, '_loop.md'), '{{> _loop.md }}')
+        self.assertRaises(Exception, expand_includes, '{{> _loop.md }}', self.page)
+        write_file(self.page, '{{> _loop.md }}')
+        self.assertEqual(find_includes(self.page), [os.path.join(self.root, '_loop.md')])
+
+    def test_nearest_template(self):
+        content = os.path.join(self.root, 'content')
+        write_file(os.path.join(content, 'blog', 'template.html'), '')
+        os.makedirs(os.path.join(content, 'blog', '2024'))
+        found = {}
+        self.assertEqual(find_template(os.path.join(content, 'blog', '2024'), content, 'default.html', found), os.path.join(content, 'blog', 'template.html'))
+        self.assertEqual(find_template(content, content, 'default.html', found), 'default.html')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from sitegen.feeds import atom_feed, load_metadata, new_metadata, normalize_date, published, save_metadata, sitemap_xml, timestamp, update_metadata, write_feeds
+
+
+def page(url, title, updated, date=None):
+    page = {'url': url, 'title': title, 'updated': updated}
+    if date:
+        page['date'] = date
+    return page
+
+
+class TestFeeds(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metadata = update_metadata(new_metadata(), {
+            'index.md': page('/', 'Home & <Away>', '2024-03-01T10:00:00Z'),
+            'old.md': page('/old/', 'Old', '2024-03-02T10:00:00Z', '2020-01-01'),
+            'new.md': page('/new.html', 'New', '2024-02-01T10:00:00Z', '2024-02-01'),
+        }, {'index.md', 'old.md', 'new.md'})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_timestamp(self):
+        self.assertEqual(timestamp(0), '1970-01-01T00:00:00Z')
+        self.assertEqual(timestamp(86400 * 10**9 + 1), '1970-01-02T00:00:00Z')
+        self.assertEqual(published(page('/', 'x', '2024-03-01T10:00:00Z', '2020-01-01')), '2020-01-01T00:00:00Z')
+
+    def test_normalize_date(self):
+        self.assertEqual(normalize_date('2020-01-01'), '2020-01-01T00:00:00Z')
+        self.assertEqual(normalize_date('2020-01-01T12:30:00+02:00'), '2020-01-01T10:30:00Z')
+        for value in ('next week', '2020-13-01', '<b>', '', None):
+            self.assertIsNone(normalize_date(value))
+        # A bad date from an older store falls back to the update time
+        self.assertEqual(published(page('/', 'x', '2024-03-01T10:00:00Z', '</published>')), '2024-03-01T10:00:00Z')
+
+    def test_sitemap(self):
+        sitemap = sitemap_xml(self.metadata, 'https://example.com/')
+        self.assertIn('<loc>https://example.com/new.html</loc><lastmod>2024-02-01T10:00:00Z</lastmod>', sitemap)
+        self.assertEqual(sitemap.count('<url>'), 3)
+        self.assertLess(sitemap.index('https://example.com/<'), sitemap.index('/new.html'))
+
+    def test_atom_feed(self):
+        feed = atom_feed(self.metadata, 'https://example.com', limit=2)
+        self.assertIn('<title>Home &amp; &lt;Away&gt;</title>', feed)
+        self.assertIn('<updated>2024-03-02T10:00:00Z</updated>', feed)
+        self.assertEqual(feed.count('<entry>'), 2)
+        self.assertLess(feed.index('<title>Home'), feed.index('<title>New</title>'))
+        self.assertNotIn('<title>Old</title>', feed)
+
+    def test_update_drops_removed_pages(self):
+        metadata = update_metadata(self.metadata, {'new.md': page('/new.html', 'Renamed', '2024-04-01T00:00:00Z')}, {'index.md', 'new.md'})
+        self.assertEqual(sorted(metadata['pages']), ['index.md', 'new.md'])
+        self.assertEqual(metadata['pages']['new.md']['title'], 'Renamed')
+
+    def test_round_trip_and_unchanged_writes(self):
+        path = os.path.join(self.tmp.name, '.build', 'pages.json')
+        save_metadata(self.metadata, path)
+        self.assertEqual(load_metadata(path), self.metadata)
+        self.assertEqual(write_feeds(self.metadata, self.tmp.name, 'https://example.com'), 2)
+        self.assertEqual(write_feeds(self.metadata, self.tmp.name, 'https://example.com'), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from fixtures import read_tree, write_file
+from sitegen.cache import FragmentCache
+from sitegen.delimiter import markdown_to_html_node
+from sitegen.generate import discover_pages, generate_pages_recursive, render_page, split_front_matter
+from sitegen.profiler import PAGE_STAGES, BuildProfile
+
+from sitegen.template import Template
+
+TEMPLATE = '<title>{{ Title }}</title><main>{{ Content }}</main>'
+
+
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.template = os.path.join(self.root, 'template.html')
+        write_file(self.template, TEMPLATE)
+        for i in range(6):
+            write_file(os.path.join(self.content, f'section{i % 2}', f'page{i}.md'), f'# Page {i}\n\nSome **bold** text {i}')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\n* one\n* two')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self, dest, **kwargs):
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, dest, **kwargs)
+        return read_tree(dest)
+
+    def test_discover_pages(self):
+        pages = discover_pages(self.content, 'public')
+        self.assertEqual(len(pages), 7)
+        self.assertIn((os.path.join(self.content, 'index.md'), os.path.join('public', 'index.html')), [page[:2] for page in pages])
+        self.assertEqual(pages, sorted(pages, key=lambda page: page.source.split(os.sep)))
+
+    def test_parallel_matches_serial(self):
+        serial = self.generate(os.path.join(self.root, 'serial'))
+        parallel = self.generate(os.path.join(self.root, 'parallel'), jobs=3)
+        self.assertEqual(len(serial), 7)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial['index.html'], '<title>Home</title><main><div><h1>Home</h1><ul><li>one</li><li>two</li></ul></div></main>')
+
+    def test_pipeline_matches_serial(self):
+        serial = self.generate(os.path.join(self.root, 'serial'))
+        pipelined = self.generate(os.path.join(self.root, 'pipelined'), pipeline=True)
+        self.assertEqual(serial, pipelined)
+
+    def test_profile_records_every_page(self):
+        plain = self.generate(os.path.join(self.root, 'plain'))
+        profile = BuildProfile()
+        profiled = self.generate(os.path.join(self.root, 'profiled'), jobs=2, profile=profile)
+        self.assertEqual(plain, profiled)
+        self.assertEqual(len(profile.pages), 7)
+        for page in profile.pages:
+            self.assertEqual(sorted(page['stages']), sorted(PAGE_STAGES))
+        self.assertIn('pages', profile.to_dict()['build_stages'])
+        self.assertIn('Slowest pages:', profile.summary())
+
+    def test_front_matter_variables(self):
+        write_file(self.template, '<title>{{ Title }}</title><p>{{ author }}</p>{{ Content }}')
+        write_file(os.path.join(self.content, 'index.md'), '---\nauthor: Bilbo\n---\n# Home\n\ntext')
+        dest = os.path.join(self.root, 'public')
+        files = self.generate(dest)
+        self.assertEqual(files['index.html'], '<title>Home</title><p>Bilbo</p><div><h1>Home</h1><p>text</p></div>')
+        self.assertEqual(files['index.html'], render_page('---\nauthor: Bilbo\n---\n# Home\n\ntext', Template('<title>{{ Title }}</title><p>{{ author }}</p>{{ Content }}')))
+
+    def test_split_front_matter(self):
+        self.assertEqual(split_front_matter('# Home'), ({}, '# Home'))
+        self.assertEqual(split_front_matter('---\na: 1\nb: x: y\n---\n# Home'), ({'a': '1', 'b': 'x: y'}, '# Home'))
+
+    def test_template_change_uses_cached_fragments(self):
+        dest = os.path.join(self.root, 'public')
+        manifest = os.path.join(self.root, 'manifest.json')
+        cache = FragmentCache(os.path.join(self.root, 'fragments'), 1 << 20)
+        first = self.generate(dest, manifest_path=manifest, incremental=True, cache=cache)
+        write_file(self.template, '<h1>{{ Title }}</h1>{{ Content }}')
+        with mock.patch('sitegen.generate.markdown_to_html_node', side_effect=AssertionError('re-parsed')):
+            second = self.generate(dest, manifest_path=manifest, incremental=True, cache=cache)
+        self.assertEqual(len(second), 7)
+        self.assertEqual(second['index.html'], first['index.html'].replace('<title>', '<h1>').replace('</title><main>', '</h1>').replace('</main>', ''))
+
+    def test_large_sources_stream_past_the_cache(self):
+        write_file(os.path.join(self.content, 'large.md'), '# Large\n\n' + '\n\n'.join(f'Paragraph **{i}**' for i in range(200)))
+        expected = self.generate(os.path.join(self.root, 'plain'))
+        cache = FragmentCache(os.path.join(self.root, 'fragments'), 1 << 20)
+        with mock.patch('sitegen.generate.STREAM_BYTES', 1000), mock.patch('sitegen.generate.markdown_to_html_node', wraps=markdown_to_html_node) as parse:
+            streamed = self.generate(os.path.join(self.root, 'public'), cache=cache)
+        self.assertEqual(streamed, expected)
+        # Only the seven small pages went through the cache
+        self.assertEqual(parse.call_count, 7)
+        self.assertEqual(len(read_tree(os.path.join(self.root, 'fragments'))), 7)
+
+    def test_errors_reported_per_file(self):
+        write_file(os.path.join(self.content, 'broken.md'), 'no title here')
+        dest = os.path.join(self.root, 'public')
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertRaises(Exception, generate_pages_recursive, self.content, self.template, dest, jobs=2)
+        self.assertIn('broken.md: Exception: Markdown has no h1 header', output.getvalue())
+        self.assertEqual(len(read_tree(dest)), 7)
+
+    def test_failed_page_leaves_no_temp_file(self):
+        write_file(os.path.join(self.content, 'bad', 'index.md'), '# Bad\n\nan **unclosed bold')
+        dest = os.path.join(self.root, 'public')
+        for kwargs in ({}, {'cache': FragmentCache(os.path.join(self.root, 'cache'), 1 << 20)}, {'pipeline': True}):
+            with redirect_stdout(StringIO()):
+                self.assertRaises(Exception, generate_pages_recursive, self.content, self.template, dest, **kwargs)
+            self.assertEqual([path for path in read_tree(dest) if path.endswith('.tmp')], [])
+            self.assertFalse(os.path.exists(os.path.join(dest, 'bad', 'index.html')))
+
+    def test_identical_output_not_rewritten(self):
+        dest = os.path.join(self.root, 'public')
+        self.generate(dest)
+        index = os.path.join(dest, 'index.html')
+        os.utime(index, ns=(1, 1))
+        write_file(os.path.join(self.content, 'section0', 'page0.md'), '# Page 0\n\nNew text')
+        for kwargs in ({}, {'jobs': 2}, {'pipeline': True}):
+            output = StringIO()
+            with redirect_stdout(output):
+                generate_pages_recursive(self.content, self.template, dest, **kwargs)
+            self.assertEqual(os.stat(index).st_mtime_ns, 1)
+        self.assertIn('Output files: 0 written, 7 unchanged', output.getvalue())
+
+    def test_section_template_and_includes(self):
+        write_file(os.path.join(self.content, 'section1', 'template.html'), '<section>{{ Content }}</section>')
+        write_file(os.path.join(self.content, '_partials', 'note.md'), 'A *shared* note')
+        write_file(os.path.join(self.content, 'section1', 'page1.md'), '# Page 1\n\n{{> ../_partials/note.md }}\n\nAfter')
+        dest = os.path.join(self.root, 'public')
+        files = self.generate(dest)
+        self.assertEqual(len(files), 7)
+        self.assertEqual(files[os.path.join('section1', 'page1.html')], '<section><div><h1>Page 1</h1><p>A <i>shared</i> note</p><p>After</p></div></section>')
+        self.assertTrue(files[os.path.join('section0', 'page0.html')].startswith('<title>'))
+
+    def test_included_title_renders_the_same_in_every_mode(self):
+        write_file(self.template, '<title>{{ Title }}</title><p>{{ author }}</p>{{ Content }}')
+        write_file(os.path.join(self.content, '_head.md'), '---\nauthor: Bilbo\n---\n# Hello')
+        write_file(os.path.join(self.content, 'index.md'), '{{> _head.md }}\n\nBody')
+        cache = FragmentCache(os.path.join(self.root, 'fragments'), 1 << 20)
+        modes = [{}, {'cache': cache}, {'pipeline': True}, {'jobs': 2}]
+        outputs = [self.generate(os.path.join(self.root, f'public{i}'), **kwargs) for i, kwargs in enumerate(modes)]
+        with mock.patch('sitegen.generate.STREAM_BYTES', 0):
+            outputs.append(self.generate(os.path.join(self.root, 'streamed'), cache=cache))
+        self.assertEqual(outputs, [outputs[0]] * len(outputs))
+        self.assertEqual(outputs[0]['index.html'], '<title>Hello</title><p>Bilbo</p><div><h1>Hello</h1><p>Body</p></div>')
+
+    def test_include_change_rebuilds_dependents(self):
+        write_file(os.path.join(self.content, '_note.md'), 'Old note')
+        write_file(os.path.join(self.content, 'section0', 'page0.md'), '# Page 0\n\n{{> ../_note.md }}')
+        dest = os.path.join(self.root, 'public')
+        manifest_path = os.path.join(self.root, '.build', 'manifest.json')
+        self.generate(dest, manifest_path=manifest_path, incremental=True)
+        write_file(os.path.join(self.content, '_note.md'), 'New note')
+        output = StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, manifest_path, incremental=True, explain=True)
+        self.assertIn(f'Rebuilding {os.path.join(self.content, "section0", "page0.md")}: {os.path.join(self.content, "_note.md")} changed', output.getvalue())
+        self.assertIn('1 of 7 pages rebuilt', output.getvalue())
+        self.assertIn('New note', read_tree(dest)[os.path.join('section0', 'page0.html')])
+
+    def test_search_index_updates_changed_pages(self):
+        dest = os.path.join(self.root, 'public')
+        manifest_path = os.path.join(self.root, '.build', 'manifest.json')
+        search_store = os.path.join(self.root, '.build', 'search.json')
+        self.generate(dest, manifest_path=manifest_path, incremental=True, search_store=search_store)
+        write_file(os.path.join(self.content, 'section0', 'page2.md'), '# Page 2\n\nA *zebra* appears')
+        os.remove(os.path.join(self.content, 'section1', 'page1.md'))
+        output = StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, manifest_path, incremental=True, search_store=search_store)
+        self.assertIn('Search index: 6 pages (1 tokenised)', output.getvalue())
+        files = read_tree(os.path.join(dest, 'search'))
+        pages = json.loads(files['pages.json'])
+        shard = json.loads(files['terms-0.json'])
+        self.assertEqual([pages[posting[0]]['url'] for posting in shard['zebra']], ['/section0/page2.html'])
+        self.assertEqual(shard['zebra'][0][1:], [3])
+        self.assertNotIn('/section1/page1.html', [page and page['url'] for page in pages])
+
+    def test_search_index_skips_unchanged_pages_in_full_builds(self):
+        write_file(os.path.join(self.content, '_zebra.md'), 'A *zebra*')
+        write_file(os.path.join(self.content, 'section0', 'page0.md'), '# Page 0\n\n{{> ../_zebra.md }}')
+        search_store = os.path.join(self.root, '.build', 'search.json')
+        cache = FragmentCache(os.path.join(self.root, 'cache'), 1024 * 1024)
+        modes = [{}, {'jobs': 2}, {'pipeline': True, 'cache': cache}, {'profile': BuildProfile()}, {'cache': cache}]
+        indexes = []
+        for kwargs in modes:
+            dest = os.path.join(self.root, 'public')
+            if os.path.exists(search_store):
+                os.remove(search_store)
+            output = StringIO()
+            # Rendered pages hand their text to the index, so no source is read a second time
+            with mock.patch('sitegen.generate.read_page_info', side_effect=AssertionError), redirect_stdout(output):
+                generate_pages_recursive(self.content, self.template, dest, search_store=search_store, **kwargs)
+                generate_pages_recursive(self.content, self.template, dest, search_store=search_store, **kwargs)
+            self.assertIn('Search index: 7 pages (7 tokenised)', output.getvalue())
+            self.assertIn('Search index: 7 pages (0 tokenised)', output.getvalue())
+            indexes.append(read_tree(os.path.join(dest, 'search')))
+        self.assertEqual(indexes, [indexes[0]] * len(modes))
+        self.assertIn('"zebra"', indexes[0]['terms-0.json'])
+        write_file(os.path.join(self.content, '_zebra.md'), 'A *yak*')
+        output = StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, search_store=search_store)
+        self.assertIn('Search index: 7 pages (1 tokenised)', output.getvalue())
+        self.assertNotIn('"zebra"', read_tree(os.path.join(dest, 'search'))['terms-0.json'])
+
+    def test_sitemap_and_feed_from_metadata(self):
+        dest = os.path.join(self.root, 'public')
+        manifest_path = os.path.join(self.root, '.build', 'manifest.json')
+        metadata_store = os.path.join(self.root, '.build', 'pages.json')
+        kwargs = {'incremental': True, 'metadata_store': metadata_store, 'base_url': 'https://example.com'}
+        self.generate(dest, manifest_path=manifest_path, **kwargs)
+        write_file(os.path.join(self.content, 'section0', 'page2.md'), '---\ndate: 2030-01-01\n---\n# Latest\n\nText')
+        output = StringIO()
+        with redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, manifest_path, **kwargs)
+        self.assertIn('Sitemap and feed: 7 pages (1 updated)', output.getvalue())
+        files = read_tree(dest)
+        self.assertEqual(files['sitemap.xml'].count('<url>'), 7)
+        self.assertIn('<loc>https://example.com/section0/page2.html</loc>', files['sitemap.xml'])
+        entry = files['feed.xml'].index('<entry>')
+        self.assertEqual(files['feed.xml'].index('<title>Latest</title>'), entry + len('<entry>\n    '))
+        self.assertIn('<published>2030-01-01T00:00:00Z</published>', files['feed.xml'])
+
+    def test_feed_uses_rendered_titles_and_checks_dates(self):
+        write_file(os.path.join(self.content, '_head.md'), '---\ndate: 2030-01-01\n---\n# Hello')
+        write_file(os.path.join(self.content, 'index.md'), '{{> _head.md }}\n\nBody')
+        write_file(os.path.join(self.content, 'section0', 'page0.md'), '---\ndate: <soon>\n---\n# Page 0')
+        metadata_store = os.path.join(self.root, '.build', 'pages.json')
+        for kwargs in ({}, {'pipeline': True}, {'jobs': 2}):
+            dest = os.path.join(self.root, 'public')
+            if os.path.exists(metadata_store):
+                os.remove(metadata_store)
+            output = StringIO()
+            with mock.patch('sitegen.generate.read_page_info', side_effect=AssertionError), redirect_stdout(output):
+                generate_pages_recursive(self.content, self.template, dest, metadata_store=metadata_store, base_url='https://example.com', **kwargs)
+            self.assertIn(f"Ignoring date '<soon>' in {os.path.join(self.content, 'section0', 'page0.md')}", output.getvalue())
+            feed = read_tree(dest)['feed.xml']
+            self.assertIn('<title>Hello</title>\n    <id>https://example.com/</id>\n    <link href="https://example.com/"/>\n    <published>2030-01-01T00:00:00Z</published>', feed)
+            self.assertNotIn('soon', feed)
+        # Pages the store misses that were not rendered are read with their includes; a failure is reported per page
+        manifest_path = os.path.join(self.root, '.build', 'manifest.json')
+        kwargs = {'incremental': True, 'metadata_store': metadata_store, 'base_url': 'https://example.com'}
+        self.generate(dest, manifest_path=manifest_path, incremental=True)
+        os.remove(metadata_store)
+        self.generate(dest, manifest_path=manifest_path, **kwargs)
+        self.assertIn('<title>Hello</title>', read_tree(dest)['feed.xml'])
+        os.remove(metadata_store)
+        output = StringIO()
+        with mock.patch('sitegen.generate.read_page_info', side_effect=Exception('unreadable')), redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, manifest_path, **kwargs)
+        self.assertIn(f"Error reading {os.path.join(self.content, 'index.md')}: Exception: unreadable", output.getvalue())
+        self.assertIn('Sitemap and feed: 0 pages (0 updated)', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
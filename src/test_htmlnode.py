@@ -1,6 +1,7 @@
+import io
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from sitegen.htmlnode import HTMLNode, LeafNode, ParentNode, FrozenNode, freeze, frozen_leaf, frozen_parent
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -30,6 +31,11 @@ class TestHTMLNode(unittest.TestCase):
         expected = 'Tag: None\nValue: 1\nChildren: None\nProps: a=b'
         self.assertEqual(to_str_html, expected)
 
+    def test_slots(self):
+        self.assertFalse(hasattr(HTMLNode('1'), '__dict__'))
+        self.assertFalse(hasattr(LeafNode('1', 'a'), '__dict__'))
+        self.assertFalse(hasattr(ParentNode([], 'a'), '__dict__'))
+
 
 class TestLeafNode(unittest.TestCase):
     tag1 = 'a'
@@ -99,5 +105,70 @@ class TestParentNode(unittest.TestCase):
         expected = '<a><b><c>Leaf value</c></b></a>'
         self.assertEqual(node.to_html(), expected)
 
+    def test_deep_nesting(self):
+        node = LeafNode('deep', 'i')
+        for _ in range(5000):
+            node = ParentNode([node], 'b')
+        html = node.to_html()
+        self.assertTrue(html.startswith('<b><b>'))
+        self.assertEqual(len(html), 5000 * 7 + len('<i>deep</i>'))
+
+    def test_write_html(self):
+        node = ParentNode(
+            [
+                ParentNode([LeafNode('one', None), LeafNode('two', 'a', {'href': 'x'})], 'p'),
+                LeafNode('three', 'i'),
+            ],
+            'div'
+        )
+        fp = io.StringIO()
+        node.write_html(fp)
+        self.assertEqual(fp.getvalue(), node.to_html())
+        self.assertEqual(fp.getvalue(), '<div><p>one<a href=x>two</a></p><i>three</i></div>')
+
+    def test_nested_missing_children(self):
+        node = ParentNode([ParentNode([], 'b')], 'a')
+        self.assertRaises(ValueError, node.to_html)
+
+
+class TestFrozenNode(unittest.TestCase):
+    def test_freeze(self):
+        node = ParentNode([ParentNode([LeafNode('one'), LeafNode('two', 'a', {'href': 'x'})], 'p'), LeafNode('three', 'i')], 'div')
+        frozen = freeze(node)
+        self.assertIsInstance(frozen, FrozenNode)
+        self.assertEqual(frozen.to_html(), node.to_html())
+        self.assertEqual(frozen.html, '<div><p>one<a href=x>two</a></p><i>three</i></div>')
+        self.assertEqual(frozen.children[0].children[1].props['href'], 'x')
+
+    def test_immutable(self):
+        frozen = freeze(ParentNode([LeafNode('text', 'b', {'class': 'x'})], 'p'))
+        self.assertRaises(AttributeError, setattr, frozen, 'tag', 'div')
+        self.assertRaises(AttributeError, setattr, frozen, 'html', '')
+        self.assertRaises(AttributeError, delattr, frozen, 'children')
+        with self.assertRaises(TypeError):
+            frozen.children[0].props['class'] = 'y'
+
+    def test_identical_subtrees_shared(self):
+        first = freeze(ParentNode([ParentNode([LeafNode('shared', 'i')], 'li')], 'ul'))
+        second = freeze(ParentNode([ParentNode([LeafNode('shared', 'i')], 'li')], 'ol'))
+        self.assertIs(first.children[0], second.children[0])
+        self.assertIs(frozen_parent((frozen_leaf('x'),), 'p'), frozen_parent((frozen_leaf('x'),), 'p'))
+
+    def test_frozen_child_of_mutable_tree(self):
+        item = frozen_parent((frozen_leaf('item'),), 'li')
+        node = ParentNode([item, ParentNode([item], 'ul')], 'ul')
+        self.assertEqual(node.to_html(), '<ul><li>item</li><ul><li>item</li></ul></ul>')
+        self.assertIs(freeze(node).children[0], item)
+
+    def test_deep_nesting(self):
+        node = LeafNode('deep', 'i')
+        for _ in range(5000):
+            node = ParentNode([node], 'b')
+        self.assertEqual(freeze(node).html, node.to_html())
+
+    def test_missing_children(self):
+        self.assertRaises(ValueError, frozen_parent, (), 'p')
+        self.assertRaises(ValueError, freeze, ParentNode([ParentNode([], 'b')], 'a'))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+from sitegen.manifest import hash_bytes, load_manifest, merge_manifests, new_manifest, plan_pages, remove_output, save_manifest, shard_manifest_path
+from sitegen.plan import PAGE, PlanEntry
+
+
+class TestPlanPages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.src = os.path.join(self.root, 'index.md')
+        self.dest = os.path.join(self.root, 'public', 'index.html')
+        with open(self.src, 'w') as f:
+            f.write('# Title')
+        os.makedirs(os.path.dirname(self.dest))
+        with open(self.dest, 'w') as f:
+            f.write('<h1>Title</h1>')
+        self.template = os.path.join(self.root, 'template.html')
+        with open(self.template, 'w') as f:
+            f.write('{{ Content }}')
+        self.templates = lambda src: self.template
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pages(self):
+        stat = os.stat(self.src)
+        return [PlanEntry(self.src, self.dest, PAGE, stat.st_mtime_ns, stat.st_size)]
+
+    def test_new_page_rendered(self):
+        to_render, stale, entries, _ = plan_pages(self.pages(), self.templates, new_manifest())
+        self.assertEqual(to_render, [(self.src, self.dest, self.template)])
+        self.assertEqual(stale, [])
+        self.assertEqual(entries[self.src]['source'], hash_bytes(b'# Title'))
+
+    def test_unchanged_page_skipped(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        to_render, stale, _, _ = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(to_render, [])
+        self.assertEqual(stale, [])
+
+    def test_full_build_renders_everything(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        to_render, _, _, reasons = plan_pages(self.pages(), self.templates, manifest, incremental=False)
+        self.assertEqual(to_render, [(self.src, self.dest, self.template)])
+
+    def test_template_change_rendered(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        with open(self.template, 'w') as f:
+            f.write('<main>{{ Content }}</main>')
+        to_render, _, _, reasons = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(to_render, [(self.src, self.dest, self.template)])
+        self.assertEqual(reasons[self.src], f'{self.template} changed')
+
+    def test_other_template_rendered(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        other = os.path.join(self.root, 'other.html')
+        to_render, _, entries, reasons = plan_pages(self.pages(), lambda src: other, manifest)
+        self.assertEqual(to_render, [(self.src, self.dest, other)])
+        self.assertEqual(reasons[self.src], f'template is now {other}')
+        self.assertEqual(entries[self.src]['deps'], {other: None})
+
+    def test_include_change_rendered(self):
+        partial = os.path.join(self.root, '_note.md')
+        with open(partial, 'w') as f:
+            f.write('A note')
+        with open(self.src, 'w') as f:
+            f.write('# Title\n\n{{> _note.md }}\n')
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(sorted(manifest['pages'][self.src]['deps']), [partial, self.template])
+        to_render, _, _, _ = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(to_render, [])
+        with open(partial, 'w') as f:
+            f.write('Another note')
+        to_render, _, _, reasons = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(to_render, [(self.src, self.dest, self.template)])
+        self.assertEqual(reasons[self.src], f'{partial} changed')
+
+    def test_source_change_rendered(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        with open(self.src, 'w') as f:
+            f.write('# Other title')
+        to_render, _, _, reasons = plan_pages(self.pages(), self.templates, manifest)
+        self.assertEqual(to_render, [(self.src, self.dest, self.template)])
+
+    def test_removed_source_is_stale(self):
+        manifest = new_manifest()
+        _, _, manifest['pages'], _ = plan_pages(self.pages(), self.templates, manifest)
+        to_render, stale, entries, _ = plan_pages([], self.templates, manifest)
+        self.assertEqual(to_render, [])
+        self.assertEqual(stale, [self.dest])
+        self.assertEqual(entries, {})
+
+
+class TestManifestFile(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, '.build', 'manifest.json')
+            manifest = new_manifest()
+            manifest['pages']['a.md'] = {'source': 'x'}
+            save_manifest(manifest, path)
+            self.assertEqual(load_manifest(path), manifest)
+
+    def test_missing_or_corrupt(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'manifest.json')
+            self.assertEqual(load_manifest(path), new_manifest())
+            with open(path, 'w') as f:
+                f.write('{not json')
+            self.assertEqual(load_manifest(path), new_manifest())
+
+    def test_merge_shard_manifests(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'manifest.json')
+            paths = []
+            for index in (1, 2):
+                manifest = new_manifest()
+                manifest['pages'][f'{index}.md'] = {'source': str(index)}
+                manifest['static'][f'{index}.css'] = {'size': index}
+                paths.append(shard_manifest_path(path, index, 2))
+                save_manifest(manifest, paths[-1])
+            merged = merge_manifests(paths)
+            self.assertEqual(sorted(merged['pages']), ['1.md', '2.md'])
+            self.assertEqual(merged['static'], {'1.css': {'size': 1}})
+            self.assertRaises(Exception, merge_manifests, paths[:1])
+            self.assertRaises(Exception, merge_manifests, paths + [shard_manifest_path(path, 1, 3)])
+            self.assertRaises(Exception, merge_manifests, [path])
+
+    def test_remove_output_prunes_empty_dirs(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'a', 'b', 'page.html')
+            os.makedirs(os.path.dirname(path))
+            open(path, 'w').close()
+            remove_output(path, root)
+            self.assertFalse(os.path.exists(os.path.join(root, 'a')))
+            self.assertTrue(os.path.exists(root))
+
+
+if __name__ == "__main__":
+    unittest.main()
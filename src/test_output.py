@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sitegen.output import replace_if_changed, write_if_changed, write_json
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'page.html')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_write_skipped(self):
+        self.assertTrue(write_if_changed(self.path, b'<p>one</p>'))
+        os.utime(self.path, ns=(1, 1))
+        self.assertFalse(write_if_changed(self.path, b'<p>one</p>'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+        self.assertTrue(write_if_changed(self.path, b'<p>two</p>'))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'<p>two</p>')
+        self.assertEqual(os.listdir(self.tmp.name), ['page.html'])
+
+    def test_replace_if_changed(self):
+        tmp_path = self.path + '.tmp'
+        for data, expected in ((b'a', True), (b'a', False), (b'b', True)):
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            self.assertEqual(replace_if_changed(tmp_path, self.path), expected)
+            self.assertFalse(os.path.exists(tmp_path))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'b')
+
+    def test_write_json(self):
+        path = os.path.join(self.tmp.name, '.build', 'store.json')
+        write_json(path, {'b': 1, 'a': [2]}, sort_keys=True)
+        with open(path) as f:
+            self.assertEqual(f.read(), '{"a": [2], "b": 1}')
+        with mock.patch('os.replace') as replace:
+            write_json(path, {})
+        # Concurrent builds in one root each write their own temp file
+        self.assertEqual(replace.call_args[0], (f'{path}.{os.getpid()}.tmp', path))
+        self.assertRaises(TypeError, write_json, path, {'not json': object()})
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['store.json'])
+
+    def test_failed_write_leaves_no_temp_file(self):
+        with self.assertRaises(TypeError):
+            write_if_changed(self.path, 'not bytes')
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
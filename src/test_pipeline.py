@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from sitegen.pipeline import make_dirs, run_pipeline
+
+
+def write_output(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.pages = []
+        for i in range(20):
+            src = os.path.join(self.root, f'{i}.md')
+            with open(src, 'w') as f:
+                f.write(f'page {i}')
+            self.pages.append((src, os.path.join(self.root, 'out', f'dir{i % 3}', f'{i}.html')))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pages_rendered_in_order(self):
+        results = list(run_pipeline(self.pages, lambda src, text: text.upper(), write_output, prefetch=4, writers=2))
+        self.assertEqual([page for page, _ in results], self.pages)
+        self.assertTrue(all(error is None for _, error in results))
+        with open(self.pages[7][1]) as f:
+            self.assertEqual(f.read(), 'PAGE 7')
+
+    def test_errors_reported_per_page(self):
+        def render(src, text):
+            if text == 'page 3':
+                raise ValueError('bad page')
+            return text
+        pages = self.pages + [(os.path.join(self.root, 'missing.md'), os.path.join(self.root, 'out', 'missing.html'))]
+        errors = dict((page[0], error) for page, error in run_pipeline(pages, render, write_output))
+        self.assertIsInstance(errors[self.pages[3][0]], ValueError)
+        self.assertIsInstance(errors[pages[-1][0]], FileNotFoundError)
+        self.assertEqual(sum(1 for error in errors.values() if error is None), 19)
+
+    def test_make_dirs(self):
+        make_dirs([dest for _, dest in self.pages])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, 'out'))), ['dir0', 'dir1', 'dir2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
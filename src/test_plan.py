@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from sitegen.plan import ASSET, PAGE, PlanEntry, build_plan, entries_of_kind, load_plan, save_plan, scan, shard_entries, shard_index
+
+
+class TestPlan(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.static = os.path.join(self.root, 'static')
+        self.public = os.path.join(self.root, 'public')
+        files = {
+            os.path.join(self.content, 'index.md'): '# Home',
+            os.path.join(self.content, 'notes.txt'): 'not a page',
+            os.path.join(self.content, 'blog', 'post.md'): '# Post',
+            os.path.join(self.static, 'index.css'): 'body {}',
+            os.path.join(self.static, 'images', 'logo.png'): 'png',
+        }
+        for path, text in files.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_pages(self):
+        pages = scan(self.content, self.public, PAGE)
+        self.assertEqual([(page.source, page.dest) for page in pages], [
+            (os.path.join(self.content, 'blog', 'post.md'), os.path.join(self.public, 'blog', 'post.html')),
+            (os.path.join(self.content, 'index.md'), os.path.join(self.public, 'index.html')),
+        ])
+        self.assertEqual(pages[1].size, len('# Home'))
+
+    def test_scan_assets(self):
+        assets = scan(self.static, self.public, ASSET)
+        self.assertEqual([asset.dest for asset in assets], [
+            os.path.join(self.public, 'images', 'logo.png'),
+            os.path.join(self.public, 'index.css'),
+        ])
+
+    def test_plan_round_trip(self):
+        plan = build_plan(self.content, self.static, self.public)
+        self.assertEqual(len(entries_of_kind(plan, PAGE)), 2)
+        self.assertEqual(len(entries_of_kind(plan, ASSET)), 2)
+        path = os.path.join(self.root, '.build', 'plan.json')
+        save_plan(plan, path)
+        self.assertEqual(load_plan(path), plan)
+
+    def test_shards_are_disjoint_and_stable(self):
+        pages = [PlanEntry(os.path.join(self.content, f'page{i}.md'), f'page{i}.html', PAGE, 0, 0) for i in range(100)]
+        shards = [shard_entries(pages, self.content, index, 4) for index in range(1, 5)]
+        self.assertEqual(sorted(page for shard in shards for page in shard), sorted(pages))
+        self.assertTrue(all(shard for shard in shards))
+        self.assertEqual(shard_index(os.path.join(self.content, 'blog', 'post.md'), self.content, 4), shard_index('blog/post.md', '.', 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
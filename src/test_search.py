@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sitegen.search import build_index, new_store, page_text, page_url, term_positions, tokenize, update_store, write_index
+
+
+def page(url, text):
+    return {'url': url, 'title': url, 'terms': term_positions(text)}
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, 'search')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_page_text(self):
+        markdown = '# A *Title*\n\n* [link text](https://example.com/x)\n* ![alt](img.png) item\n\n> quoted `code`'
+        self.assertEqual(page_text(markdown), 'A Title\nlink text\nalt item\nquoted code')
+        self.assertEqual(tokenize('Hello, World! hello_2'), ['hello', 'world', 'hello_2'])
+        self.assertEqual(term_positions('to be or not to be'), {'to': [0, 4], 'be': [1, 5], 'or': [2], 'not': [3]})
+
+    def test_page_url(self):
+        self.assertEqual(page_url(os.path.join('public', 'blog', 'index.html'), 'public'), '/blog/')
+        self.assertEqual(page_url(os.path.join('public', 'about.html'), 'public'), '/about.html')
+
+    def test_ids_stable(self):
+        store = update_store(new_store(), {'b': page('/b', 'two'), 'c': page('/c', 'three')}, {'b', 'c'})
+        self.assertEqual([store['pages'][source]['id'] for source in 'bc'], [0, 1])
+        store = update_store(store, {'a': page('/a', 'one'), 'c': page('/c', 'four')}, {'a', 'c'})
+        self.assertEqual(store['pages']['a']['id'], 0)
+        self.assertEqual(store['pages']['c']['id'], 1)
+        self.assertEqual(store['pages']['c']['terms'], {'four': [0]})
+        self.assertNotIn('b', store['pages'])
+
+    def test_shards_bounded(self):
+        words = ' '.join(f'word{i}' for i in range(500))
+        store = update_store(new_store(), {'a': page('/a', words), 'b': page('/b', 'word7 word7')}, {'a', 'b'})
+        page_list, shards = build_index(store, shard_bytes=1024)
+        self.assertEqual(page_list, [{'url': '/a', 'title': '/a'}, {'url': '/b', 'title': '/b'}])
+        self.assertGreater(len(shards), 5)
+        for shard in shards:
+            self.assertLessEqual(len(json.dumps(shard, separators=(',', ':'))), 1024)
+        terms = [term for shard in shards for term in shard]
+        self.assertEqual(terms, sorted(terms))
+        postings = dict(item for shard in shards for item in shard.items())
+        self.assertEqual(postings['word7'], [[0, 7], [1, 0, 1]])
+
+    def test_write_index(self):
+        words = ' '.join(f'word{i}' for i in range(500))
+        store = update_store(new_store(), {'a': page('/a', words)}, {'a'})
+        stats = write_index(store, self.dest, shard_bytes=1024)
+        with open(os.path.join(self.dest, 'index.json')) as index_file:
+            index = json.load(index_file)
+        self.assertEqual(len(index['shards']), stats['shards'])
+        self.assertEqual(index['shards'][0]['first'], 'word0')
+        for shard in index['shards']:
+            with open(os.path.join(self.dest, shard['file'])) as shard_file:
+                terms = sorted(json.load(shard_file))
+            self.assertEqual((terms[0], terms[-1]), (shard['first'], shard['last']))
+        store = update_store(store, {'a': page('/a', 'short')}, {'a'})
+        stats = write_index(store, self.dest, shard_bytes=1024)
+        self.assertEqual(stats['shards'], 1)
+        self.assertGreater(stats['removed'], 0)
+        self.assertEqual(sorted(os.listdir(self.dest)), ['index.json', 'pages.json', 'terms-0.json'])
+        self.assertEqual(write_index(store, self.dest, shard_bytes=1024)['written'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
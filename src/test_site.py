@@ -0,0 +1,73 @@
+import gzip
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from fixtures import read_file, write_file
+from sitegen import Site
+
+
+class TestSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        write_file(os.path.join(self.root, 'template.html'), '<title>{{ Title }}</title>{{ Content }}')
+        write_file(os.path.join(self.root, 'static', 'style.css'), 'body {}')
+        for i in range(4):
+            write_file(os.path.join(self.root, 'content', f'page{i}.md'), f'# Page {i}\n\nText {i}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, site):
+        output = StringIO()
+        with redirect_stdout(output):
+            site.build()
+        return output.getvalue()
+
+    def test_repeated_builds(self):
+        site = Site(self.root, incremental=True)
+        self.assertIn('4 of 4 pages rebuilt', self.build(site))
+        self.assertIn('0 of 4 pages rebuilt', self.build(site))
+        write_file(os.path.join(self.root, 'content', 'page2.md'), '# Page 2\n\nChanged')
+        self.assertIn('1 of 4 pages rebuilt', self.build(site))
+        with open(os.path.join(self.root, 'public', 'page2.html')) as page_file:
+            self.assertEqual(page_file.read(), '<title>Page 2</title><div><h1>Page 2</h1><p>Changed</p></div>')
+        self.assertTrue(os.path.isfile(os.path.join(self.root, 'public', 'style.css')))
+        self.assertTrue(os.path.isfile(os.path.join(self.root, '.build', 'manifest.json')))
+
+    def test_template_change_between_builds(self):
+        site = Site(self.root, incremental=True)
+        self.build(site)
+        write_file(os.path.join(self.root, 'template.html'), '<main>{{ Content }}</main>')
+        self.assertIn('4 of 4 pages rebuilt', self.build(site))
+        with open(os.path.join(self.root, 'public', 'page0.html')) as page_file:
+            self.assertTrue(page_file.read().startswith('<main>'))
+
+    def test_compress_static_text_files(self):
+        shipped = os.path.join(self.root, 'static', 'app.js.gz')
+        write_file(os.path.join(self.root, 'static', 'app.js'), 'run()')
+        write_file(shipped, 'shipped')
+        write_file(os.path.join(self.root, 'static', 'archive.tar.gz'), 'archive')
+        site = Site(self.root, compress=True)
+        for _ in range(2):
+            self.build(site)
+            with gzip.open(os.path.join(self.root, 'public', 'style.css.gz'), 'rt') as variant:
+                self.assertEqual(variant.read(), 'body {}')
+            self.assertTrue(os.path.isfile(os.path.join(self.root, 'public', 'page0.html.gz')))
+            self.assertEqual(read_file(os.path.join(self.root, 'public', 'app.js.gz')), 'shipped')
+            self.assertEqual(read_file(os.path.join(self.root, 'public', 'archive.tar.gz')), 'archive')
+        site.compress_public()
+        self.assertEqual(read_file(os.path.join(self.root, 'public', 'app.js.gz')), 'shipped')
+
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, Site, self.root, jobs=-1)
+        self.assertRaises(ValueError, Site, self.root, jobs=2, pipeline=True)
+        self.assertRaises(ValueError, Site, self.root, shard=(1, 2), search=True)
+        self.assertRaises(ValueError, Site, self.root, shard=(1, 2), compress=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from fixtures import read_file, write_file
+from sitegen.sync import copy_file, sync_dir
+
+
+class TestSyncDir(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'static')
+        self.dest = os.path.join(self.tmp.name, 'public')
+        write_file(os.path.join(self.src, 'index.css'), 'body {}')
+        write_file(os.path.join(self.src, 'images', 'a.png'), 'png')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copies_then_skips(self):
+        entries, stats = sync_dir(self.src, self.dest)
+        self.assertEqual(stats, {'copied': 2, 'unchanged': 0, 'removed': 0})
+        self.assertEqual(read_file(os.path.join(self.dest, 'images', 'a.png')), 'png')
+        _, stats = sync_dir(self.src, self.dest, entries)
+        self.assertEqual(stats, {'copied': 0, 'unchanged': 2, 'removed': 0})
+
+    def test_changed_file_copied(self):
+        entries, _ = sync_dir(self.src, self.dest)
+        write_file(os.path.join(self.src, 'index.css'), 'body { color: red }')
+        _, stats = sync_dir(self.src, self.dest, entries)
+        self.assertEqual(stats['copied'], 1)
+        self.assertEqual(read_file(os.path.join(self.dest, 'index.css')), 'body { color: red }')
+
+    def test_checksum_skips_touched_file(self):
+        entries, _ = sync_dir(self.src, self.dest)
+        path = os.path.join(self.src, 'index.css')
+        os.utime(path, ns=(0, 10**9))
+        _, stats = sync_dir(self.src, self.dest, entries, checksum=True)
+        self.assertEqual(stats['copied'], 0)
+        self.assertEqual(os.stat(os.path.join(self.dest, 'index.css')).st_mtime_ns, 10**9)
+
+    def test_stale_files_removed(self):
+        write_file(os.path.join(self.dest, 'index.html'), 'generated')
+        entries, _ = sync_dir(self.src, self.dest)
+        os.remove(os.path.join(self.src, 'images', 'a.png'))
+        _, stats = sync_dir(self.src, self.dest, entries)
+        self.assertEqual(stats['removed'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, 'images')))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, 'index.html')))
+
+    def test_hardlink_not_written_through(self):
+        sync_dir(self.src, self.dest, link=True)
+        dest_path = os.path.join(self.dest, 'index.css')
+        self.assertEqual(os.stat(dest_path).st_ino, os.stat(os.path.join(self.src, 'index.css')).st_ino)
+        copy_file(os.path.join(self.src, 'images', 'a.png'), dest_path)
+        self.assertEqual(read_file(os.path.join(self.src, 'index.css')), 'body {}')
+
+
+if __name__ == "__main__":
+    unittest.main()
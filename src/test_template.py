@@ -0,0 +1,59 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from sitegen.template import Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_compile(self):
+        template = Template('<title>{{ Title }}</title>{{Content}}!')
+        self.assertEqual(template.literals, ['<title>', '</title>', '!'])
+        self.assertEqual(template.names, ['Title', 'Content'])
+
+    def test_render(self):
+        template = Template('<title> {{ Title }} </title><p>{{ Content }}</p>{{ Title }}')
+        html = template.render({'Title': 'Home', 'Content': '<b>hi</b>'})
+        self.assertEqual(html, '<title> Home </title><p><b>hi</b></p>Home')
+
+    def test_unknown_placeholder_kept(self):
+        template = Template('{{ Title }} by {{  Author }}')
+        self.assertEqual(template.render({'Title': 'Home'}), 'Home by {{  Author }}')
+
+    def test_values_not_substituted_again(self):
+        template = Template('{{ Title }}|{{ Content }}')
+        self.assertEqual(template.render({'Title': '{{ Content }}', 'Content': 'x'}), '{{ Content }}|x')
+
+    def test_write_streams_chunks(self):
+        template = Template('<main>{{ Content }}</main><h1>{{ Title }}</h1>')
+        fp = io.StringIO()
+        template.write(fp, {'Title': 'T', 'Content': iter(['<p>', 'a', '</p>'])})
+        self.assertEqual(fp.getvalue(), '<main><p>a</p></main><h1>T</h1>')
+
+    def test_write_repeated_stream(self):
+        template = Template('{{ Content }}|{{ Content }}')
+        fp = io.StringIO()
+        template.write(fp, {'Content': iter(['a', 'b'])})
+        self.assertEqual(fp.getvalue(), 'ab|ab')
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_cached_until_modified(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'template.html')
+            with open(path, 'w') as f:
+                f.write('{{ Title }}')
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w') as f:
+                f.write('<b>{{ Title }}</b>')
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+            second = load_template(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.render({'Title': 'x'}), '<b>x</b>')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
+import io
 import unittest
 
-from delimiter import split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes, markdown_to_blocks, block_to_block_type
-from htmlnode import ParentNode, LeafNode
-from textnode import TextNode, text_node_to_html_node
+from sitegen.delimiter import split_nodes_delimiter, extract_markdown_images, extract_markdown_links, extract_markdown_link_spans, split_nodes_image, split_nodes_link, text_to_textnodes, markdown_to_blocks, block_to_block_type, iter_markdown_blocks, iter_markdown_html, markdown_to_block_records, markdown_to_html_node, inline_to_html, inline_cache_stats, frozen_block
+from sitegen.htmlnode import ParentNode, LeafNode, frozen_leaf, frozen_parent
+from sitegen.textnode import TextNode, text_node_to_html_node
 
 
 class TestTextNode(unittest.TestCase):
@@ -26,6 +27,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", "bold", None)
         self.assertNotEqual(node, node2)
 
+    def test_slots(self):
+        node = TextNode("This is a text node", "bold")
+        self.assertFalse(hasattr(node, '__dict__'))
+        self.assertEqual(repr(node), 'TextNode(This is a text node, bold, None)')
+
 
 class TestTextToHTML(unittest.TestCase):
     def test_invalid_type(self):
@@ -265,6 +271,29 @@ class TestSplitLinks(unittest.TestCase):
         ]
         self.assertEqual(new_nodes, expected)
 
+    def test_repeated_and_bracketed_links(self):
+        node = TextNode('[a](b)[a](b) and [[c]](d)', 'text')
+        expected = [
+            TextNode('a', 'link', 'b'),
+            TextNode('a', 'link', 'b'),
+            TextNode(' and [', 'text'),
+            TextNode('c', 'link', 'd'),
+        ]
+        self.assertEqual(split_nodes_link([node]), expected)
+
+    def test_stray_opening_bracket_kept(self):
+        self.assertEqual(split_nodes_link([TextNode('a[[x](y)', 'text')]), [TextNode('a[', 'text'), TextNode('x', 'link', 'y')])
+        self.assertEqual(extract_markdown_link_spans('a[[x](y)'), [(2, 8, 'x', 'y')])
+        self.assertEqual(split_nodes_image([TextNode('[![i](u)', 'text')]), [TextNode('[', 'text'), TextNode('i', 'image', 'u')])
+
+    def test_many_links(self):
+        text = ' '.join(f'[page {i}](/p/{i}) ![icon](/i/{i}.png)' for i in range(5000))
+        nodes = split_nodes_link(split_nodes_image([TextNode(text, 'text')]))
+        self.assertEqual(len(nodes), 20000 - 1)
+        self.assertEqual(nodes[-3], TextNode('page 4999', 'link', '/p/4999'))
+        self.assertEqual(nodes[-1], TextNode('icon', 'image', '/i/4999.png'))
+        self.assertEqual(extract_markdown_link_spans(text)[1], (33, 47, 'page 1', '/p/1'))
+
 
 class TestConverter(unittest.TestCase):
     def test_converter(self):
@@ -290,6 +319,32 @@ class TestConverter(unittest.TestCase):
         new_nodes = text_to_textnodes(test_text)
         self.assertEqual(expected, new_nodes)
 
+    def test_converter_edges(self):
+        self.assertEqual(text_to_textnodes('**bold**'), [TextNode('bold', 'bold')])
+        self.assertEqual(text_to_textnodes(''), [])
+        expected = [
+            TextNode('multi\nline', 'italic'),
+            TextNode(' and ', 'text'),
+            TextNode('a*b', 'code'),
+        ]
+        self.assertEqual(text_to_textnodes('*multi\nline* and `a*b`'), expected)
+
+    def test_converter_stray_brackets(self):
+        expected = [
+            TextNode('Footnote [', 'text'),
+            TextNode('1', 'link', '#fn1'),
+            TextNode('] here', 'text'),
+        ]
+        self.assertEqual(text_to_textnodes('Footnote [[1](#fn1)] here'), expected)
+        self.assertEqual(text_to_textnodes('[![i](u)'), [TextNode('[', 'text'), TextNode('i', 'image', 'u')])
+        self.assertEqual(text_to_textnodes('[w![i](v)a'), [TextNode('[w', 'text'), TextNode('i', 'image', 'v'), TextNode('a', 'text')])
+        self.assertEqual(text_to_textnodes('[**b**](u)'), [TextNode('[', 'text'), TextNode('b', 'bold'), TextNode('](u)', 'text')])
+
+    def test_converter_unmatched(self):
+        self.assertRaises(Exception, text_to_textnodes, 'an **unmatched word')
+        self.assertRaises(Exception, text_to_textnodes, 'an *unmatched word')
+        self.assertRaises(Exception, text_to_textnodes, 'an `unmatched word')
+
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_function(self):
@@ -320,7 +375,76 @@ class TestMarkdownToBlocks(unittest.TestCase):
             'This is a paragraph of text. It has some **bold** and *italic* words inside of it.'
         ]
         self.assertEqual(markdown_to_blocks(test_text), expected)
-        
+
+    def test_iter_blocks_from_file(self):
+        test_text = '# Heading  \n\n\n\n  first line\nsecond line\n  \n\n* a\n* b\n\n\n'
+        blocks = list(iter_markdown_blocks(io.StringIO(test_text)))
+        self.assertEqual(blocks, ['# Heading', 'first line\nsecond line', '* a\n* b'])
+        self.assertEqual(blocks, markdown_to_blocks(test_text))
+
+    def test_iter_html_matches_tree(self):
+        test_text = '# Title\n\nSome **bold** text\n\n> a quote\n\n1. one\n2. two\n\n```\ncode\n```'
+        streamed = ''.join(iter_markdown_html(io.StringIO(test_text)))
+        self.assertEqual(streamed, markdown_to_html_node(test_text).to_html())
+        self.assertRaises(ValueError, lambda: list(iter_markdown_html(io.StringIO('\n\n'))))
+
+    def test_iter_html_does_not_intern(self):
+        test_text = '# Streamed title\n\n' + '\n\n'.join(f'* streamed item {i}\n* another {i}' for i in range(50))
+        before = (frozen_block.cache_info().currsize, frozen_leaf.cache_info().currsize, frozen_parent.cache_info().currsize)
+        streamed = ''.join(iter_markdown_html(io.StringIO(test_text)))
+        after = (frozen_block.cache_info().currsize, frozen_leaf.cache_info().currsize, frozen_parent.cache_info().currsize)
+        self.assertEqual(after, before)
+        self.assertEqual(streamed, markdown_to_html_node(test_text).to_html())
+
+    def test_block_records(self):
+        test_text = '## Title\n\n* a\n* b\n\n1. one\n2. two\n\n> quote'
+        self.assertEqual(markdown_to_block_records(test_text), [
+            ('heading', ['## Title']),
+            ('unordered_list', ['* a', '* b']),
+            ('ordered_list', ['1. one', '2. two']),
+            ('quote', ['> quote']),
+        ])
+
+    def test_fenced_code_keeps_empty_lines(self):
+        test_text = 'Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro'
+        self.assertEqual(markdown_to_blocks(test_text), ['Intro', '```\nfirst\n\n\nsecond\n```', 'Outro'])
+        self.assertEqual(markdown_to_html_node(test_text).to_html(), '<div><p>Intro</p><pre><code>\nfirst\n\n\nsecond\n</code></pre><p>Outro</p></div>')
+
+    def test_unclosed_fence_splits_at_empty_lines(self):
+        self.assertEqual(markdown_to_blocks('```\ncode\n\ntext'), ['```\ncode', 'text'])
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_repeated_spans_hit(self):
+        text = 'a **repeated** [span](https://example.com/inline-cache-test)'
+        before = inline_cache_stats()
+        self.assertEqual(inline_to_html(text), 'a <b>repeated</b> <a href=https://example.com/inline-cache-test>span</a>')
+        html = markdown_to_html_node(f'* {text}\n* {text}\n* {text}').to_html()
+        after = inline_cache_stats()
+        self.assertEqual(html.count('<b>repeated</b>'), 3)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 3)
+
+    def test_long_spans_not_cached(self):
+        text = 'a long paragraph with **bold** words ' * 20
+        before = inline_cache_stats()
+        self.assertEqual(inline_to_html(text), inline_to_html(text))
+        self.assertIn('<b>bold</b>', inline_to_html(text))
+        self.assertEqual(inline_cache_stats(), before)
+
+    def test_errors_not_cached(self):
+        self.assertRaises(Exception, inline_to_html, 'an *unmatched word')
+        self.assertRaises(Exception, inline_to_html, 'an *unmatched word')
+
+    def test_repeated_blocks_shared(self):
+        footer = '* [home](/)\n* [about](/about)'
+        first = markdown_to_html_node(f'# One\n\n{footer}')
+        second = markdown_to_html_node(f'# Two\n\n{footer}')
+        self.assertIs(first.children[1], second.children[1])
+        self.assertEqual(first.children[1].html, '<ul><li><a href=/>home</a></li><li><a href=/about>about</a></li></ul>')
+        self.assertEqual(first.to_html(), '<div><h1>One</h1><ul><li><a href=/>home</a></li><li><a href=/about>about</a></li></ul></div>')
+
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading(self):
         text = '# is a comment'
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from urllib.request import urlopen
+
+from sitegen.watch import LIVE_RELOAD_SCRIPT, LiveReload, changed_paths, inject_live_reload, serve, snapshot
+
+
+class TestLiveReload(unittest.TestCase):
+    def test_inject(self):
+        self.assertEqual(inject_live_reload('<body>a</body>'), '<body>a' + LIVE_RELOAD_SCRIPT + '</body>')
+        self.assertEqual(inject_live_reload('a'), 'a' + LIVE_RELOAD_SCRIPT)
+
+    def test_wait(self):
+        live_reload = LiveReload()
+        self.assertEqual(live_reload.wait(0, 0.01), 0)
+        live_reload.notify()
+        self.assertEqual(live_reload.wait(0, 0.01), 1)
+
+    def test_server_injects_html_only(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, 'index.html'), 'w') as f:
+                f.write('<body>home</body>')
+            with open(os.path.join(root, 'index.css'), 'w') as f:
+                f.write('body {}')
+            server = serve(root, 0, LiveReload())
+            try:
+                port = server.server_address[1]
+                with urlopen(f'http://127.0.0.1:{port}/') as response:
+                    self.assertIn('EventSource', response.read().decode())
+                with urlopen(f'http://127.0.0.1:{port}/index.css') as response:
+                    self.assertEqual(response.read().decode(), 'body {}')
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_changes(self):
+        with tempfile.TemporaryDirectory() as root:
+            page = os.path.join(root, 'content', 'index.md')
+            template = os.path.join(root, 'template.html')
+            os.makedirs(os.path.dirname(page))
+            for path in [page, template]:
+                with open(path, 'w') as f:
+                    f.write('x')
+            before = snapshot([os.path.dirname(page), template])
+            self.assertEqual(sorted(before), sorted([page, template]))
+            os.utime(page, ns=(0, 10**9))
+            new_page = os.path.join(root, 'content', 'new.md')
+            open(new_page, 'w').close()
+            os.remove(template)
+            after = snapshot([os.path.dirname(page), template])
+            self.assertEqual(changed_paths(before, after), {page, new_page, template})
+
+
+if __name__ == "__main__":
+    unittest.main()